@@ -1,26 +1,48 @@
 import streamlit as st
+import numpy as np
+import pandas as pd
 import plotly.express as px
+from data_store import get_shared_data, show_data_freshness
+from player_search import SORT_STATS
+from utils import select_form_window
 
 st.title("Player Statistics")
 
+data = get_shared_data()
+show_data_freshness(data)
+
 # Player search and filters
-col1, col2 = st.columns([2, 1])
+col1, col2, col3 = st.columns([2, 1, 1])
 with col1:
     search_term = st.text_input("Search Players", "")
 with col2:
-    stat_filter = st.selectbox("Sort By", ["points", "assists", "completions", "throws", "catches"])
+    stat_filter = st.selectbox("Sort By", SORT_STATS)
+with col3:
+    window = select_form_window(data.index.weeks, key="player_form")
 
-# Filter players based on search
-filtered_players = st.session_state.players_df[
-    st.session_state.players_df['name'].str.contains(search_term, case=False)
-]
+# Search and sort through the prebuilt index, falling back to similar names
+positions = data.search_index.search(search_term, sort_by=stat_filter)
+if len(positions) == 0 and search_term:
+    positions = data.search_index.search(search_term, fuzzy=True)
+    if len(positions):
+        st.caption(f"No players named \"{search_term}\"; showing similar names.")
 
-# Sort players
-sorted_players = filtered_players.sort_values(stat_filter, ascending=False)
+if window:
+    # Totals over the chosen games come from the prefix-sum form stats
+    form = data.player_form.window(**window)
+    positions = positions[np.argsort(-form[stat_filter].to_numpy()[positions], kind='stable')]
+    sorted_players = pd.concat([
+        data.players_df[['name', 'team']].iloc[positions].reset_index(drop=True),
+        form.iloc[positions].reset_index(drop=True)
+    ], axis=1)
+    display_cols = ['name', 'team', 'games', 'points', 'assists', 'completions', 'throws', 'catches']
+else:
+    sorted_players = data.players_df.iloc[positions]
+    display_cols = ['name', 'team', 'points', 'assists', 'completions', 'throws', 'catches']
 
 # Display players table
 st.dataframe(
-    sorted_players[['name', 'team', 'points', 'assists', 'completions', 'throws', 'catches']],
+    sorted_players[display_cols],
     use_container_width=True
 )
 
@@ -1,53 +1,38 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
+from data_store import get_shared_data, show_data_freshness
+from charts import record_figure, point_differential_figure, rating_figure
 
 st.title("League Standings")
 
-# Calculate current standings
-standings = []
-for _, team in st.session_state.teams_df.iterrows():
-    wins = team['wins']
-    losses = team['losses']
-    win_percentage = wins / (wins + losses) if (wins + losses) > 0 else 0
-    
-    standings.append({
-        'team': team['name'],
-        'wins': wins,
-        'losses': losses,
-        'win_percentage': win_percentage,
-        'points_for': team['points_for'],
-        'points_against': team['points_against'],
-        'point_differential': team['points_for'] - team['points_against']
-    })
+data = get_shared_data()
+show_data_freshness(data)
 
-standings_df = pd.DataFrame(standings)
-standings_df = standings_df.sort_values('win_percentage', ascending=False)
+# Standings, tiebreakers and power ratings are precomputed by the pipeline
+standings_df = data.views['standings']
 
 # Display standings table
 st.dataframe(
     standings_df.round(3),
-    use_container_width=True
+    use_container_width=True,
+    hide_index=True
+)
+st.caption(
+    "Teams level on win percentage are ordered by their head-to-head record against each other, "
+    "then head-to-head point differential, overall point differential and power rating."
 )
 
-# Visualization of standings
+# Visualization of standings, cached per data version
 st.subheader("Win-Loss Record")
-fig = px.bar(
-    standings_df,
-    x='team',
-    y=['wins', 'losses'],
-    title="Team Records",
-    barmode='group'
-)
+fig = record_figure(data.version, standings_df)
 st.plotly_chart(fig, use_container_width=True)
 
 # Point differential chart
 st.subheader("Point Differential")
-fig = px.bar(
-    standings_df,
-    x='team',
-    y='point_differential',
-    title="Team Point Differential",
-    color='point_differential'
-)
+fig = point_differential_figure(data.version, standings_df)
+st.plotly_chart(fig, use_container_width=True)
+
+# Power ratings
+st.subheader("Power Ratings")
+fig = rating_figure(data.version, standings_df)
 st.plotly_chart(fig, use_container_width=True)
@@ -0,0 +1,247 @@
+"""Time ingestion, aggregation, view building and page lookups on a synthetic season
+
+Run from the UltimateDash directory:
+
+    python -m benchmarks.pipeline_benchmark                  # compare with this machine's baselines
+    python -m benchmarks.pipeline_benchmark --save-baseline  # record this machine's baselines
+
+Each case's best time is compared with benchmarks/baselines.json, and the
+run fails when a case is slower than its baseline by more than --tolerance.
+Wall times only compare on the same hardware, so baselines are kept per
+machine (CPU, core count and Python version). On a machine with none yet,
+nothing is compared; record them with --save-baseline on the commit to
+compare against.
+
+Cases are timed in rounds, each running every case once, and a case's best
+round counts; a busy spell on the machine then costs one round of several
+cases rather than every run of one. Cases faster than
+MIN_MEASUREMENT_SECONDS are looped so each measurement lasts at least that
+long, and garbage collection is paused while timing.
+"""
+import gc
+import os
+import sys
+import json
+import platform
+import argparse
+import tempfile
+from typing import Callable, Dict
+from data_generator import generate_season, write_game_files, FIRST_NAMES, LAST_NAMES
+from data_processing.storage import read_table
+from data_processing.schema import GAME_HASHES_TABLE
+from data_processing.process_game_data import integrate_raw_game_data
+from data_processing.calculate_statistics import (
+    calculate_team_statistics, calculate_player_statistics, calculate_all_statistics,
+    calculate_statistics_incremental, calculate_statistics_streaming, calculate_pass_edge_partials,
+    calculate_pass_network
+)
+from data_processing.views import build_views
+from data_processing.ratings import calculate_ratings, update_ratings
+from data_index import build_data_index
+from player_search import PlayerSearchIndex
+from pass_network import PassingNetwork
+from form_stats import FORM_WINDOWS, build_player_form, build_team_form
+from utils import calculate_team_stats
+from benchmarks.team_statistics_benchmark import best_time
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+DEFAULT_TOLERANCE = 1.25
+
+# Shorter measurements are mostly timer and scheduler noise
+MIN_MEASUREMENT_SECONDS = 0.1
+
+# Name fragments searched on the Players page benchmark, after the empty query the page starts with
+SEARCH_QUERIES = [""] + [name.lower()[:3] for name in FIRST_NAMES] + LAST_NAMES
+
+def build_cases(work_dir: str, scale: Dict[str, int]) -> Dict[str, Callable[[], object]]:
+    """Generate a season under `work_dir` and return the benchmark cases, ready to run"""
+    game_dir = os.path.join(work_dir, "game_day_info")
+    integ_dir = os.path.join(work_dir, "integ-data")
+    warm_cache_dir = os.path.join(work_dir, "game-cache")
+    stats_dir = os.path.join(work_dir, "stats")
+
+    write_game_files(generate_season(**scale), game_dir)
+
+    # Prime the game cache and incremental partials, and read the inputs the way the pipeline does
+    integrate_raw_game_data(None, integ_dir, game_dir, cache_dir=warm_cache_dir)
+    points_df = read_table(integ_dir, 'Points')
+    passes_df = read_table(integ_dir, 'Passes')
+    player_stats_df = read_table(integ_dir, 'Player-Stats')
+    game_hashes = read_table(integ_dir, GAME_HASHES_TABLE)
+    calculate_statistics_incremental(points_df, passes_df, player_stats_df, stats_dir, game_hashes=game_hashes)
+
+    team_stats_overall, team_stats_game, player_stats_overall, player_stats_game = calculate_all_statistics(
+        points_df, passes_df, player_stats_df)
+    pass_network = calculate_pass_network(calculate_pass_edge_partials(passes_df))
+    views = build_views(team_stats_overall, team_stats_game, player_stats_overall, player_stats_game, pass_network)
+    index = build_data_index(views['teams'], views['players'], views['games'], views)
+    search_index = PlayerSearchIndex(views['players'])
+    network = PassingNetwork(views['pass_network'])
+    player_form = build_player_form(views['players'], views['player_game_log'])
+    update_ratings(views['games'], stats_dir)
+
+    def ingest_cold():
+        integrate_raw_game_data(None, integ_dir, game_dir, cache_dir=tempfile.mkdtemp(dir=work_dir))
+
+    def player_search():
+        for query in SEARCH_QUERIES:
+            search_index.search(query, sort_by='points')
+
+    def pass_network_queries():
+        for team in index.team_names:
+            network.top_connections(team)
+            network.centrality(team)
+
+    def form_queries():
+        for window in FORM_WINDOWS.values():
+            player_form.window(**window)
+        for week in index.weeks:
+            player_form.window(weeks=(week, week))
+
+    def team_page_stats():
+        for team in index.team_names:
+            calculate_team_stats(views['games'], team, index)
+
+    return {
+        'ingest_cold': ingest_cold,
+        'ingest_warm': lambda: integrate_raw_game_data(None, integ_dir, game_dir, cache_dir=warm_cache_dir),
+        'team_statistics': lambda: calculate_team_statistics(points_df, passes_df),
+        'player_statistics': lambda: calculate_player_statistics(player_stats_df, passes_df),
+        'all_statistics': lambda: calculate_all_statistics(points_df, passes_df, player_stats_df),
+        'incremental_unchanged': lambda: calculate_statistics_incremental(
+            points_df, passes_df, player_stats_df, stats_dir, game_hashes=game_hashes),
+        'streaming': lambda: calculate_statistics_streaming(integ_dir),
+        'build_views': lambda: build_views(team_stats_overall, team_stats_game, player_stats_overall,
+                                           player_stats_game, pass_network),
+        'data_index': lambda: build_data_index(views['teams'], views['players'], views['games'], views),
+        'player_search_index': lambda: PlayerSearchIndex(views['players']),
+        'player_search': player_search,
+        'pass_network_build': lambda: PassingNetwork(views['pass_network']),
+        'pass_network_queries': pass_network_queries,
+        'form_build': lambda: (build_player_form(views['players'], views['player_game_log']),
+                               build_team_form(views['teams'], views['team_game_log'])),
+        'form_queries': form_queries,
+        'ratings_full': lambda: calculate_ratings(views['games']),
+        'ratings_unchanged': lambda: update_ratings(views['games'], stats_dir),
+        'team_page_stats': team_page_stats
+    }
+
+def machine_id() -> str:
+    """The hardware and Python a set of baselines was recorded on"""
+    cpu = platform.processor() or platform.machine()
+    if os.path.exists("/proc/cpuinfo"):
+        with open("/proc/cpuinfo") as f:
+            models = [line.split(":", 1)[1].strip() for line in f if line.startswith("model name")]
+        cpu = models[0] if models else cpu
+    major, minor, _ = platform.python_version_tuple()
+    return f"{platform.system()} {platform.machine()}, {cpu}, {os.cpu_count()} cpus, Python {major}.{minor}"
+
+def measure(case: Callable[[], object], loops: int) -> float:
+    """Wall time of one call of a case, averaged over `loops` calls, in seconds
+
+    As with timeit, garbage collection is paused while timing, so when
+    earlier cases left garbage behind doesn't decide which case pays for
+    collecting it.
+    """
+    gc.collect()
+    gc.disable()
+    try:
+        return best_time(lambda: [case() for _ in range(loops)], repeat=1) / loops
+    finally:
+        gc.enable()
+
+def loops_needed(case: Callable[[], object]) -> int:
+    """Calls of a case per measurement, so that a measurement lasts at least MIN_MEASUREMENT_SECONDS"""
+    loops = 1
+    while measure(case, loops) * loops < MIN_MEASUREMENT_SECONDS:
+        loops *= 10
+    return loops
+
+def time_cases(cases: Dict[str, Callable[[], object]], rounds: int) -> Dict[str, float]:
+    """Best time per call of every case over several rounds that each run all the cases"""
+    loops = {name: loops_needed(case) for name, case in cases.items()}
+    times = {name: [] for name in cases}
+    for _ in range(rounds):
+        for name, case in cases.items():
+            times[name].append(measure(case, loops[name]))
+    return {name: min(case_times) for name, case_times in times.items()}
+
+def load_baselines(machine: str, path: str = BASELINES_PATH) -> Dict:
+    """Stored scale and per-case times for a machine, or an empty record"""
+    empty = {'scale': None, 'cases': {}}
+    if not os.path.exists(path):
+        return empty
+    with open(path) as f:
+        return json.load(f)['machines'].get(machine, empty)
+
+def save_baselines(machine: str, scale: Dict[str, int], results: Dict[str, float], path: str = BASELINES_PATH):
+    """Record this run's times as the machine's new baselines, keeping other machines' ones"""
+    machines = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            machines = json.load(f)['machines']
+    machines[machine] = {'scale': scale, 'cases': {name: round(t, 6) for name, t in results.items()}}
+    with open(path, "w") as f:
+        json.dump({'machines': machines}, f, indent=2)
+        f.write("\n")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--teams', type=int, default=16)
+    parser.add_argument('--weeks', type=int, default=12)
+    parser.add_argument('--points-per-game', type=int, default=25)
+    parser.add_argument('--passes-per-point', type=int, default=8)
+    parser.add_argument('--players-per-team', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=5, help="Rounds of every case")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--cases', nargs='*', help="Only run these cases")
+    parser.add_argument('--save-baseline', action='store_true')
+    args = parser.parse_args()
+
+    scale = {
+        'teams': args.teams,
+        'weeks': args.weeks,
+        'points_per_game': args.points_per_game,
+        'passes_per_point': args.passes_per_point,
+        'players_per_team': args.players_per_team,
+        'seed': args.seed
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        cases = build_cases(work_dir, scale)
+        results = time_cases({name: case for name, case in cases.items() if not args.cases or name in args.cases},
+                             args.repeat)
+
+    machine = machine_id()
+    if args.save_baseline:
+        save_baselines(machine, scale, results)
+        print(f"Saved baselines for {len(results)} cases on {machine} to {BASELINES_PATH}")
+
+    baselines = load_baselines(machine)
+    comparable = baselines['scale'] == scale
+    if baselines['scale'] is None:
+        print(f"No baselines recorded for {machine}; not comparing. "
+              "Record them with: python -m benchmarks.pipeline_benchmark --save-baseline")
+    elif not comparable:
+        print("Stored baselines were recorded at a different scale; not comparing")
+
+    regressions = []
+    print(f"{'case':<24}{'time (ms)':>12}{'baseline':>12}{'ratio':>8}")
+    for name, elapsed in results.items():
+        baseline = baselines['cases'].get(name) if comparable else None
+        line = f"{name:<24}{elapsed * 1000:12.1f}"
+        if baseline:
+            ratio = elapsed / baseline
+            line += f"{baseline * 1000:12.1f}{ratio:8.2f}"
+            if ratio > args.tolerance:
+                regressions.append(name)
+                line += "  REGRESSION"
+        print(line)
+
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.2f}x: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
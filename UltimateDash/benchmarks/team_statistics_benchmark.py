@@ -0,0 +1,84 @@
+"""Compare the lambda-based team aggregation with the vectorized one
+
+Run from the UltimateDash directory:
+
+    python -m benchmarks.team_statistics_benchmark --games 500
+"""
+import argparse
+import time
+import pandas as pd
+from data_processing.calculate_statistics import calculate_team_statistics
+from data_generator import generate_season
+
+def legacy_team_statistics(points_df: pd.DataFrame, passes_df: pd.DataFrame):
+    """Team aggregation as it was before vectorizing the hold count"""
+    team_goal_stats = points_df.groupby('team', observed=True).agg({
+        'Scored?': ['sum', 'count'],
+        'Started on offense?': lambda x: sum((x == 1) & (points_df['Scored?'] == 1)),
+        'Defensive blocks': 'sum',
+        'Turnovers': 'sum'
+    }).reset_index()
+
+    team_pass_stats = passes_df.groupby('team', observed=True).agg({
+        'Turnover?': ['count', 'sum'],
+        'Huck?': 'sum',
+        'Forward distance (yd)': 'mean'
+    }).reset_index()
+
+    team_stats_overall = pd.merge(team_goal_stats, team_pass_stats, on='team')
+    team_stats_overall.columns = [
+        'team', 'goals', 'total_points', 'holds', 'blocks', 'turnovers',
+        'pass_attempts', 'failed_passes', 'hucks', 'avg_throw_distance'
+    ]
+
+    team_stats_game = points_df.groupby(['team', 'match', 'week'], observed=True).agg({
+        'Scored?': ['sum', 'count'],
+        'Started on offense?': lambda x: sum((x == 1) & (points_df['Scored?'] == 1)),
+        'Defensive blocks': 'sum',
+        'Turnovers': 'sum'
+    }).reset_index()
+    team_stats_game.columns = [
+        'team', 'match', 'week', 'goals', 'total_points', 'holds', 'blocks', 'turnovers'
+    ]
+
+    return team_stats_overall, team_stats_game
+
+def synthetic_season(games: int, teams: int = 16, points_per_game: int = 25, passes_per_point: int = 8, seed: int = 0):
+    """Points and Passes tables of a generated season with about `games` games"""
+    weeks = max(1, round(games / (teams // 2)))
+    season = generate_season(teams, weeks, points_per_game, passes_per_point, seed=seed)
+    return season['Points'], season['Passes']
+
+def best_time(func, *args, repeat: int = 3) -> float:
+    """Best wall time of several runs, in seconds"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=1)
+    args = parser.parse_args()
+
+    points_df, passes_df = synthetic_season(args.games)
+
+    # Both versions must agree before their timings mean anything
+    legacy_overall, legacy_game = legacy_team_statistics(points_df, passes_df)
+    overall, game = calculate_team_statistics(points_df, passes_df)
+    pd.testing.assert_frame_equal(legacy_overall, overall[legacy_overall.columns], check_dtype=False)
+    pd.testing.assert_frame_equal(legacy_game, game[legacy_game.columns], check_dtype=False)
+
+    legacy = best_time(legacy_team_statistics, points_df, passes_df, repeat=args.repeat)
+    vectorized = best_time(calculate_team_statistics, points_df, passes_df, repeat=args.repeat)
+
+    print(f"{len(points_df[['match', 'week']].drop_duplicates())} games, {len(points_df)} points, {len(passes_df)} passes")
+    print(f"legacy:     {legacy * 1000:8.1f} ms")
+    print(f"vectorized: {vectorized * 1000:8.1f} ms")
+    print(f"speedup:    {legacy / vectorized:8.1f}x")
+
+if __name__ == "__main__":
+    main()
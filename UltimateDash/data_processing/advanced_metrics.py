@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+from data_processing.schema import FIELD_LENGTH_YD, ENDZONE_DEPTH_YD, START_Y_COLUMN
+
+# Passes thrown from within this many yards of the attacking goal line are red zone passes
+RED_ZONE_YD = 20
+RED_ZONE_MAX_Y = (ENDZONE_DEPTH_YD + RED_ZONE_YD) / FIELD_LENGTH_YD
+
+# Role scores run from 0 to 100; players with nothing to go on sit in the middle
+ROLE_SCORE_SCALE = 100
+NEUTRAL_ROLE_SCORE = 50
+
+# Offensive impact is counted per this many offense points played
+IMPACT_POINTS = 10
+
+def safe_divide(numerator, denominator, fill: float = 0.0) -> np.ndarray:
+    """Element-wise division that gives `fill` wherever the denominator is zero or missing"""
+    numerator = np.asarray(numerator, dtype='float64')
+    denominator = np.asarray(denominator, dtype='float64')
+    valid = (denominator != 0) & ~np.isnan(denominator)
+    return np.divide(numerator, denominator, out=np.full(numerator.shape, fill), where=valid)
+
+def in_red_zone(passes_df: pd.DataFrame) -> pd.Series:
+    """Flag passes thrown from inside the red zone; all False when passes carry no positions"""
+    if START_Y_COLUMN not in passes_df.columns:
+        return pd.Series(False, index=passes_df.index)
+    return passes_df[START_Y_COLUMN] < RED_ZONE_MAX_Y
+
+def add_team_metrics(teams_df: pd.DataFrame) -> pd.DataFrame:
+    """Add break, red zone and completion rates to season team totals"""
+    return teams_df.assign(
+        break_conversions=teams_df['breaks'],
+        break_conversion_rate=safe_divide(teams_df['breaks'], teams_df['break_opportunities']),
+        red_zone_efficiency=safe_divide(teams_df['red_zone_scores'], teams_df['red_zone_attempts']),
+        completion_percentage=1 - safe_divide(teams_df['failed_passes'], teams_df['pass_attempts'], fill=1.0)
+    )
+
+def add_player_metrics(players_df: pd.DataFrame) -> pd.DataFrame:
+    """Add efficiency, yardage, usage and role scores to season player totals
+
+    - usage_rate: share of the team's touches
+    - offensive_impact_score: goals plus assists less turnovers per 10 offense points
+    - handler_cutter_score: share of positive yards gained catching rather than throwing,
+      0 (all throwing) to 100 (all catching)
+    - offense_defense_score: share of points played on defense, 0 to 100
+    """
+    throwing_yards = players_df['Total completed throw gain (yd)'].to_numpy('float64')
+    receiving_yards = players_df['Total caught pass gain (yd)'].to_numpy('float64')
+    offense_points = players_df['Offense points played'].to_numpy('float64')
+    defense_points = players_df['Defense points played'].to_numpy('float64')
+    team_touches = players_df.groupby('team', observed=True)['Touches'].transform('sum')
+
+    # Step 1: Efficiency and volume
+    completion_percentage = safe_divide(players_df['completions'], players_df['throws'])
+    usage_rate = safe_divide(players_df['Touches'], team_touches)
+    impact = players_df['Goals'] + players_df['assists'] - players_df['turnovers']
+    offensive_impact_score = IMPACT_POINTS * safe_divide(impact, offense_points)
+
+    # Step 2: Role scores
+    gained_throwing = np.clip(throwing_yards, 0, None)
+    gained_receiving = np.clip(receiving_yards, 0, None)
+    handler_cutter_score = ROLE_SCORE_SCALE * safe_divide(
+        gained_receiving, gained_throwing + gained_receiving, fill=NEUTRAL_ROLE_SCORE / ROLE_SCORE_SCALE)
+    offense_defense_score = ROLE_SCORE_SCALE * safe_divide(
+        defense_points, offense_points + defense_points, fill=NEUTRAL_ROLE_SCORE / ROLE_SCORE_SCALE)
+
+    return players_df.assign(
+        completion_percentage=completion_percentage,
+        throwing_yards=throwing_yards,
+        receiving_yards=receiving_yards,
+        usage_rate=usage_rate,
+        offensive_impact_score=offensive_impact_score,
+        handler_cutter_score=handler_cutter_score,
+        offense_defense_score=offense_defense_score
+    )
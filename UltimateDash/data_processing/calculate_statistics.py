@@ -1,115 +1,499 @@
 import pandas as pd
 import numpy as np
 import os
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Tuple
+from data_processing.storage import read_table, write_table, iter_table_chunks, estimate_row_bytes, STORAGE_FORMAT
+from data_processing.schema import GAME_HASHES_TABLE
+from data_processing.views import build_views, build_games_view, VIEWS_DIR
+from data_processing.ratings import update_ratings
+from data_processing.advanced_metrics import in_red_zone
+from data_processing.possessions import build_possessions_table, build_points_table, segment_passes
+
+# Keys of the stored per-game aggregates
+GAME_KEYS = ['match', 'week']
+TEAM_GAME_KEYS = ['team', 'match', 'week']
+PLAYER_GAME_KEYS = ['Player', 'team', 'match', 'week']
+
+PLAYER_SUM_COLUMNS = [
+    'Touches', 'Throws', 'Catches', 'Defensive blocks', 'Goals', 'Turnovers',
+    'Total completed throw gain (yd)', 'Total caught pass gain (yd)',
+    'Offense points played', 'Defense points played', 'Possessions initiated', 'Assists'
+]
+PLAYER_YARDAGE_COLUMNS = ['Total completed throw gain (yd)', 'Total caught pass gain (yd)']
+# Decimals kept on folded yardages, well below the precision game files record them at
+YARDAGE_DECIMALS = 3
+PLAYER_OVERALL_SUM_COLUMNS = PLAYER_SUM_COLUMNS + ['red_zone_scores']
+# Counts are whole numbers again once folded; yardages stay float
+PLAYER_OVERALL_INT_COLUMNS = [col for col in PLAYER_OVERALL_SUM_COLUMNS if col not in PLAYER_YARDAGE_COLUMNS]
+PLAYER_GAME_SUM_COLUMNS = [col for col in PLAYER_SUM_COLUMNS if col != 'Possessions initiated']
+PLAYER_GAME_INT_COLUMNS = [col for col in PLAYER_GAME_SUM_COLUMNS if col not in PLAYER_YARDAGE_COLUMNS]
+
+TEAM_OVERALL_COLUMNS = [
+    'team', 'goals', 'total_points', 'holds', 'blocks', 'turnovers',
+    'pass_attempts', 'failed_passes', 'hucks', 'avg_throw_distance',
+    'breaks', 'break_opportunities', 'red_zone_attempts', 'red_zone_scores'
+]
+# Pass edge sums rolled up per team and game, and their names in the team partials
+TEAM_PASS_PARTIALS = {
+    'pass_attempts': 'pass_attempts',
+    'failed_passes': 'failed_passes',
+    'hucks': 'hucks',
+    'distance_sum': 'throw_distance_sum',
+    'distance_count': 'throw_distance_count',
+    'completed_distance_sum': 'completed_yards',
+    'red_zone_assists': 'red_zone_scores'
+}
+TEAM_GAME_COLUMNS = [
+    'team', 'match', 'week', 'goals', 'total_points', 'holds', 'breaks', 'blocks', 'turnovers',
+    'pass_attempts', 'failed_passes', 'completed_yards'
+]
+TEAM_GAME_INT_COLUMNS = ['goals', 'total_points', 'holds', 'breaks', 'blocks', 'turnovers', 'pass_attempts', 'failed_passes']
+PASS_EDGE_KEYS = TEAM_GAME_KEYS + ['Thrower', 'Receiver']
+POSSESSION_KEYS = TEAM_GAME_KEYS + ['Point', 'Possession']
+
+# Version of the stored per-game aggregates; bump it whenever their columns or
+# the way they are computed change, so an incremental run rebuilds them
+PARTIALS_VERSION = 3
+
+# Streaming mode: memory budget and how many times a chunk's size groupby copies may take
+DEFAULT_MEMORY_BUDGET_MB = 256
+STREAMING_OVERHEAD_FACTOR = 4
+MIN_CHUNK_ROWS = 1000
+
+# Point-level team aggregations, shared by the overall, per-game and partial tables
+TEAM_POINT_AGGREGATIONS = {
+    'goals': ('Scored?', 'sum'),
+    'total_points': ('Scored?', 'count'),
+    'holds': ('hold', 'sum'),
+    'breaks': ('break', 'sum'),
+    'break_opportunities': ('break_opportunity', 'sum'),
+    'blocks': ('Defensive blocks', 'sum'),
+    'turnovers': ('Turnovers', 'sum')
+}
+
+def _with_point_flags(points_df: pd.DataFrame) -> pd.DataFrame:
+    """Flag points scored after starting on offense (holds) or on defense (breaks)
+
+    A defensive point is a break opportunity once the team gets the disc;
+    without possession counts every defensive point is one.
+    """
+    scored = points_df['Scored?'] == 1
+    on_offense = points_df['Started on offense?'] == 1
+    had_disc = points_df['Possessions'] > 0 if 'Possessions' in points_df.columns else True
+    return points_df.assign(
+        hold=on_offense & scored,
+        break_opportunity=~on_offense & (had_disc | scored),
+        **{'break': ~on_offense & scored}
+    )
+
+def calculate_pass_edge_partials(passes_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate passes per game and thrower-receiver pair in a single scan
+
+    Team, thrower and receiver aggregates are all rolled up from this table,
+    which is far smaller than the pass log. Throwaways have no receiver and
+    are kept under a missing receiver.
+    """
+    assist = passes_df['Assist?'] == 1 if 'Assist?' in passes_df.columns else False
+    passes = passes_df.assign(
+        completed_distance=passes_df['Forward distance (yd)'].where(passes_df['Turnover?'] == 0),
+        red_zone_assist=in_red_zone(passes_df) & assist
+    )
+    return passes.groupby(PASS_EDGE_KEYS, observed=True, dropna=False).agg(
+        pass_attempts=('Turnover?', 'count'),
+        failed_passes=('Turnover?', 'sum'),
+        hucks=('Huck?', 'sum'),
+        distance_sum=('Forward distance (yd)', 'sum'),
+        distance_count=('Forward distance (yd)', 'count'),
+        completed_distance_sum=('completed_distance', 'sum'),
+        completed_distance_count=('completed_distance', 'count'),
+        red_zone_assists=('red_zone_assist', 'sum')
+    ).reset_index()
+
+def calculate_pass_network(pass_edges: pd.DataFrame) -> pd.DataFrame:
+    """Per-game thrower-to-receiver edges with completions, turnovers and completed yards
+
+    Throwaways are kept under a missing receiver.
+    """
+    return pd.DataFrame({
+        **{key: pass_edges[key] for key in PASS_EDGE_KEYS},
+        'completions': pass_edges['pass_attempts'] - pass_edges['failed_passes'],
+        'turnovers': pass_edges['failed_passes'],
+        'yards': pass_edges['completed_distance_sum']
+    })
+
+def calculate_red_zone_possessions(passes_df: pd.DataFrame) -> pd.DataFrame:
+    """Count red zone passes per possession, keeping only possessions that reached the red zone"""
+    possessions = build_possessions_table(passes_df)
+    return possessions.loc[possessions['red_zone_passes'] > 0, POSSESSION_KEYS + ['red_zone_passes']]
+
+def calculate_point_partials(points_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate points per team and game"""
+    return _with_point_flags(points_df).groupby(TEAM_GAME_KEYS, observed=True).agg(**TEAM_POINT_AGGREGATIONS).reset_index()
+
+def calculate_player_stat_partials(player_stats_df: pd.DataFrame) -> pd.DataFrame:
+    """Aggregate player stat rows per player and game"""
+    player_groups = player_stats_df.groupby(PLAYER_GAME_KEYS, observed=True)
+    player_partials = player_groups[PLAYER_SUM_COLUMNS].sum()
+    player_partials['stat_rows'] = player_groups.size()
+    return player_partials.reset_index()
+
+def combine_partials(partials: List[pd.DataFrame], keys: List[str]) -> pd.DataFrame:
+    """Add up partial aggregates computed over separate slices of the same input"""
+    combined = pd.concat(partials, ignore_index=True)
+    for key in keys:
+        # Slices carry different categories; compare on the values
+        if isinstance(combined[key].dtype, pd.CategoricalDtype):
+            combined[key] = combined[key].astype(str).where(combined[key].notna())
+    return combined.groupby(keys, dropna=False).sum(min_count=1).reset_index()
+
+def calculate_team_game_partials(point_partials: pd.DataFrame, pass_edges: pd.DataFrame,
+                                 red_zone_possessions: pd.DataFrame) -> pd.DataFrame:
+    """Per-game team aggregates kept as sums and counts so they can be folded exactly"""
+    pass_columns = list(TEAM_PASS_PARTIALS)
+    pass_partials = (pass_edges.groupby(TEAM_GAME_KEYS, observed=True)[pass_columns].sum()
+        .rename(columns=TEAM_PASS_PARTIALS).reset_index())
+
+    # Possessions reaching the red zone are red zone attempts
+    red_zone_attempts = red_zone_possessions.groupby(TEAM_GAME_KEYS, observed=True).size().rename('red_zone_attempts')
+    pass_partials = pass_partials.merge(red_zone_attempts.reset_index(), on=TEAM_GAME_KEYS, how='left')
+    pass_partials['red_zone_attempts'] = pass_partials['red_zone_attempts'].fillna(0)
+
+    # Outer join so passes still count towards season totals when a game's points are missing
+    return point_partials.merge(pass_partials, on=TEAM_GAME_KEYS, how='outer')
+
+def calculate_player_game_partials(player_partials: pd.DataFrame, pass_edges: pd.DataFrame) -> pd.DataFrame:
+    """Per-game player aggregates, with completed pass distances kept as sums and counts
+
+    Goals caught from red zone assists count as the receiver's red zone scores.
+    """
+    for role, prefix in [('Thrower', 'throw'), ('Receiver', 'receive')]:
+        columns = {
+            'completed_distance_sum': f'{prefix}_distance_sum',
+            'completed_distance_count': f'{prefix}_distance_count'
+        }
+        if role == 'Receiver':
+            columns['red_zone_assists'] = 'red_zone_scores'
+        role_partials = (pass_edges.groupby([role] + TEAM_GAME_KEYS, observed=True)[list(columns)].sum()
+            .rename(columns=columns).reset_index().rename(columns={role: 'Player'}))
+        player_partials = player_partials.merge(role_partials, on=PLAYER_GAME_KEYS, how='outer')
+
+    return player_partials
+
+def calculate_game_partials(points_df: pd.DataFrame, passes_df: pd.DataFrame,
+                            player_stats_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Per-game team and player aggregates from one scan of each input frame"""
+    pass_edges = calculate_pass_edge_partials(passes_df)
+    team_partials = calculate_team_game_partials(
+        calculate_point_partials(points_df), pass_edges, calculate_red_zone_possessions(passes_df))
+    player_partials = calculate_player_game_partials(calculate_player_stat_partials(player_stats_df), pass_edges)
+    return team_partials, player_partials
+
+def _mean_from_partials(total: pd.Series, count: pd.Series) -> pd.Series:
+    """Mean from a folded sum and count, NaN where nothing was counted"""
+    return total / count.where(count > 0)
+
+def fold_team_partials(team_partials: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Derive overall and per-game team tables from per-game aggregates"""
+    totals = team_partials.drop(columns=['match', 'week']).groupby('team', observed=True).sum(min_count=1).reset_index()
+    totals['avg_throw_distance'] = _mean_from_partials(totals['throw_distance_sum'], totals['throw_distance_count'])
+    totals = totals.fillna({'breaks': 0, 'break_opportunities': 0, 'red_zone_attempts': 0, 'red_zone_scores': 0})
+
+    # Season totals need passes, game rows need points
+    team_stats_overall = totals.dropna(subset=['total_points', 'pass_attempts'])[TEAM_OVERALL_COLUMNS]
+    team_stats_game = team_partials.dropna(subset=['total_points'])[TEAM_GAME_COLUMNS]
+    team_stats_game = team_stats_game.fillna({'pass_attempts': 0, 'failed_passes': 0, 'completed_yards': 0})
+    team_stats_game = team_stats_game.astype({col: int for col in TEAM_GAME_INT_COLUMNS})
+    return team_stats_overall.reset_index(drop=True), team_stats_game.reset_index(drop=True)
+
+def fold_player_partials(player_partials: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Derive overall and per-game player tables from per-game aggregates"""
+    # Yardages are stored as float32; add them up in float64 so season totals round back to the recorded tenths
+    player_partials = player_partials.astype({col: 'float64' for col in PLAYER_YARDAGE_COLUMNS})
+    totals = player_partials.drop(columns=['match', 'week']).groupby(['Player', 'team'], observed=True).sum().reset_index()
+    totals['avg_throw_distance'] = _mean_from_partials(totals['throw_distance_sum'], totals['throw_distance_count'])
+    totals['avg_receive_distance'] = _mean_from_partials(totals['receive_distance_sum'], totals['receive_distance_count'])
+
+    # Only players with stat rows get a line; passes alone just feed the averages
+    player_stats_overall = totals.loc[totals['stat_rows'] > 0, ['Player', 'team'] + PLAYER_OVERALL_SUM_COLUMNS + ['avg_throw_distance', 'avg_receive_distance']]
+    player_stats_game = player_partials.loc[player_partials['stat_rows'] > 0, PLAYER_GAME_KEYS + PLAYER_GAME_SUM_COLUMNS]
+    # float32 yardages carry tiny representation errors (806.99997); round those off and keep them float
+    player_stats_overall = player_stats_overall.round({col: YARDAGE_DECIMALS for col in PLAYER_YARDAGE_COLUMNS})
+    player_stats_game = player_stats_game.round({col: YARDAGE_DECIMALS for col in PLAYER_YARDAGE_COLUMNS})
+    player_stats_overall = player_stats_overall.astype({col: int for col in PLAYER_OVERALL_INT_COLUMNS})
+    player_stats_game = player_stats_game.astype({col: int for col in PLAYER_GAME_INT_COLUMNS})
+    return player_stats_overall.reset_index(drop=True), player_stats_game.reset_index(drop=True)
 
 def calculate_team_statistics(points_df: pd.DataFrame, passes_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Calculate team statistics both overall and per game"""
-    # Overall team statistics
-    team_goal_stats = points_df.groupby('team').agg({
-        'Scored?': ['sum', 'count'],
-        'Started on offense?': lambda x: sum((x == 1) & (points_df['Scored?'] == 1)),
-        'Defensive blocks': 'sum',
-        'Turnovers': 'sum'
-    }).reset_index()
-
-    team_pass_stats = passes_df.groupby('team').agg({
-        'Turnover?': ['count', 'sum'],
-        'Huck?': 'sum',
-        'Forward distance (yd)': 'mean'
-    }).reset_index()
-
-    # Combine stats
-    team_stats_overall = pd.merge(team_goal_stats, team_pass_stats, on='team')
-    team_stats_overall.columns = [
-        'team', 'goals', 'total_points', 'holds', 'blocks', 'turnovers',
-        'pass_attempts', 'failed_passes', 'hucks', 'avg_throw_distance'
-    ]
-
-    # Calculate per-game statistics
-    team_stats_game = points_df.groupby(['team', 'match', 'week']).agg({
-        'Scored?': ['sum', 'count'],
-        'Started on offense?': lambda x: sum((x == 1) & (points_df['Scored?'] == 1)),
-        'Defensive blocks': 'sum',
-        'Turnovers': 'sum'
-    }).reset_index()
-
-    return team_stats_overall, team_stats_game
+    team_partials = calculate_team_game_partials(
+        calculate_point_partials(points_df), calculate_pass_edge_partials(passes_df), calculate_red_zone_possessions(passes_df))
+    return fold_team_partials(team_partials)
 
 def calculate_player_statistics(player_stats_df: pd.DataFrame, passes_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """Calculate player statistics both overall and per game"""
-    # Overall player statistics
-    player_stats_overall = player_stats_df.groupby(['Player', 'team']).agg({
-        'Touches': 'sum',
-        'Throws': 'sum',
-        'Catches': 'sum',
-        'Defensive blocks': 'sum',
-        'Goals': 'sum',
-        'Turnovers': 'sum',
-        'Total completed throw gain (yd)': 'sum',
-        'Total caught pass gain (yd)': 'sum',
-        'Offense points played': 'sum',
-        'Defense points played': 'sum',
-        'Possessions initiated': 'sum',
-        'Assists': 'sum'
-    }).reset_index()
-
-    # Calculate throwing and receiving averages from passes data
-    throw_avg = passes_df[passes_df['Turnover?'] == 0].groupby('Thrower').agg({
-        'Forward distance (yd)': 'mean'
-    }).reset_index().rename(columns={'Thrower': 'Player', 'Forward distance (yd)': 'avg_throw_distance'})
-
-    receive_avg = passes_df[passes_df['Turnover?'] == 0].groupby('Receiver').agg({
-        'Forward distance (yd)': 'mean'
-    }).reset_index().rename(columns={'Receiver': 'Player', 'Forward distance (yd)': 'avg_receive_distance'})
-
-    # Merge averages into overall stats
-    player_stats_overall = (player_stats_overall
-        .merge(throw_avg, on='Player', how='left')
-        .merge(receive_avg, on='Player', how='left'))
-
-    # Per-game player statistics
-    player_stats_game = player_stats_df.groupby(['Player', 'team', 'match', 'week']).agg({
-        'Touches': 'sum',
-        'Throws': 'sum',
-        'Catches': 'sum',
-        'Defensive blocks': 'sum',
-        'Goals': 'sum',
-        'Turnovers': 'sum',
-        'Total completed throw gain (yd)': 'sum',
-        'Total caught pass gain (yd)': 'sum',
-        'Offense points played': 'sum',
-        'Defense points played': 'sum',
-        'Assists': 'sum'
-    }).reset_index()
-
-    return player_stats_overall, player_stats_game
-
-def main():
-    """Process all statistics and save results"""
+    player_partials = calculate_player_game_partials(calculate_player_stat_partials(player_stats_df), calculate_pass_edge_partials(passes_df))
+    return fold_player_partials(player_partials)
+
+def calculate_all_statistics(points_df: pd.DataFrame, passes_df: pd.DataFrame, player_stats_df: pd.DataFrame):
+    """Calculate all four statistics tables, rolling season totals up from per-game partials"""
+    team_partials, player_partials = calculate_game_partials(points_df, passes_df, player_stats_df)
+    team_stats_overall, team_stats_game = fold_team_partials(team_partials)
+    player_stats_overall, player_stats_game = fold_player_partials(player_partials)
+    return team_stats_overall, team_stats_game, player_stats_overall, player_stats_game
+
+def _chunk_rows_for_budget(base_dir: str, name: str, memory_budget_mb: int) -> int:
+    """Rows per chunk that keep a chunk and its groupby copies within the budget"""
+    row_bytes = estimate_row_bytes(base_dir, name)
+    budget_bytes = memory_budget_mb * 1024 * 1024
+    return max(int(budget_bytes / (row_bytes * STREAMING_OVERHEAD_FACTOR)), MIN_CHUNK_ROWS)
+
+def _add_partial(partials: List[pd.DataFrame], partial: pd.DataFrame, keys: List[str], max_rows: int):
+    """Keep a chunk's partials, folding the kept ones together before they outgrow a chunk"""
+    partials.append(partial)
+    if sum(len(kept) for kept in partials) > max_rows:
+        partials[:] = [combine_partials(partials, keys)]
+
+def _stream_partials(base_dir: str, name: str, partial_func, keys: List[str], memory_budget_mb: int) -> pd.DataFrame:
+    """Aggregate a stored table chunk by chunk, keeping only running partials in memory"""
+    chunk_rows = _chunk_rows_for_budget(base_dir, name, memory_budget_mb)
+
+    partials = []
+    for chunk in iter_table_chunks(base_dir, name, chunk_rows):
+        _add_partial(partials, partial_func(chunk), keys, chunk_rows)
+
+    return combine_partials(partials, keys)
+
+def _stream_passes(base_dir: str, memory_budget_mb: int) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Pass edges and red zone possessions of the pass log, from a single chunked read
+
+    Edges are aggregated per chunk like any other partials. For red zone
+    possessions, the rows of each chunk's last possession are carried into
+    the next chunk, so every possession is segmented whole. Chunks'
+    possessions are then stacked, not summed by key: without point and
+    possession numbers in the log, numbering restarts in each slice and keys
+    from different chunks can collide.
+    """
+    chunk_rows = _chunk_rows_for_budget(base_dir, 'Passes', memory_budget_mb)
+
+    pass_edges = []
+    possessions = []
+    carried = None
+    for chunk in iter_table_chunks(base_dir, 'Passes', chunk_rows):
+        _add_partial(pass_edges, calculate_pass_edge_partials(chunk), PASS_EDGE_KEYS, chunk_rows)
+
+        if carried is not None:
+            chunk = pd.concat([carried, chunk], ignore_index=True)
+        last_start = np.flatnonzero(segment_passes(chunk)['possession_starts'])[-1]
+        carried = chunk.iloc[last_start:]
+        possessions.append(calculate_red_zone_possessions(chunk.iloc[:last_start]))
+    if carried is not None:
+        possessions.append(calculate_red_zone_possessions(carried))
+
+    if not possessions:
+        red_zone_possessions = pd.DataFrame(columns=POSSESSION_KEYS + ['red_zone_passes'])
+    else:
+        red_zone_possessions = pd.concat(possessions, ignore_index=True)
+    return combine_partials(pass_edges, PASS_EDGE_KEYS), red_zone_possessions
+
+def _calculate_streaming_with_pass_edges(integ_dir: str, memory_budget_mb: int):
+    """Streamed statistics tables plus the pass edges they were built from, reading each input once"""
+    point_partials = _stream_partials(integ_dir, 'Points', calculate_point_partials, TEAM_GAME_KEYS, memory_budget_mb)
+    pass_edges, red_zone_possessions = _stream_passes(integ_dir, memory_budget_mb)
+    player_partials = _stream_partials(integ_dir, 'Player-Stats', calculate_player_stat_partials, PLAYER_GAME_KEYS, memory_budget_mb)
+
+    team_partials = calculate_team_game_partials(point_partials, pass_edges, red_zone_possessions)
+    player_partials = calculate_player_game_partials(player_partials, pass_edges)
+
+    team_stats_overall, team_stats_game = fold_team_partials(team_partials)
+    player_stats_overall, player_stats_game = fold_player_partials(player_partials)
+    return (team_stats_overall, team_stats_game, player_stats_overall, player_stats_game), pass_edges
+
+def calculate_statistics_streaming(integ_dir: str = 'integ-data', memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+    """Calculate all statistics tables without loading the integrated inputs whole
+
+    Each input is read once, in chunks sized to `memory_budget_mb`; only
+    per-game partial aggregates are kept between chunks.
+    """
+    statistics, _ = _calculate_streaming_with_pass_edges(integ_dir, memory_budget_mb)
+    return statistics
+
+def calculate_game_fingerprints(*frames: pd.DataFrame) -> pd.DataFrame:
+    """Hash every game's rows across the input frames so changed games can be found
+
+    Reads every row, so it is only the fallback for inputs integrated without game hashes.
+    """
+    fingerprints = []
+    for i, df in enumerate(frames):
+        row_hashes = pd.util.hash_pandas_object(df, index=False)
+        per_game = row_hashes.groupby([df['match'].astype(str), df['week']]).sum()
+        fingerprints.append(per_game.rename(f'fingerprint_{i}'))
+
+    return pd.concat(fingerprints, axis=1).fillna(0).astype('uint64').astype(str).reset_index()
+
+def _changed_games(current: pd.DataFrame, stored: pd.DataFrame) -> pd.DataFrame:
+    """Games whose fingerprint is new or differs from the stored one"""
+    merged = current.merge(stored, on=GAME_KEYS, how='left', suffixes=('', '_stored'), indicator=True)
+    fingerprint_cols = [c for c in current.columns if c.startswith('fingerprint_')]
+    changed = merged['_merge'] == 'left_only'
+    for col in fingerprint_cols:
+        changed |= merged[col] != merged[col + '_stored']
+    return merged.loc[changed, GAME_KEYS]
+
+def _can_reuse_partials(current: pd.DataFrame, stored: pd.DataFrame) -> bool:
+    """Whether stored fingerprints were made the same way as the current ones, for the current partials"""
+    if 'partials_version' not in stored.columns or (stored['partials_version'] != PARTIALS_VERSION).any():
+        return False
+    fingerprint_cols = {c for c in current.columns if c.startswith('fingerprint_')}
+    return fingerprint_cols == {c for c in stored.columns if c.startswith('fingerprint_')}
+
+def _filter_games(df: pd.DataFrame, games: pd.DataFrame) -> pd.DataFrame:
+    """Rows of `df` that belong to one of `games`"""
+    game_ids = pd.MultiIndex.from_frame(games.astype({'match': str}))
+    row_ids = pd.MultiIndex.from_arrays([df['match'].astype(str), df['week']])
+    return df[row_ids.isin(game_ids)]
+
+def calculate_statistics_incremental(points_df: pd.DataFrame, passes_df: pd.DataFrame,
+                                     player_stats_df: pd.DataFrame, stats_dir: str = 'stats',
+                                     storage_format: str = STORAGE_FORMAT, game_hashes: Optional[pd.DataFrame] = None):
+    """Recompute per-game aggregates only for new or changed games, then fold them into season tables
+
+    Games are told apart by `game_hashes`, the per-game fingerprints written at
+    integration from the game files' content hashes; without them every row is
+    hashed instead. Per-game aggregates and fingerprints are stored in
+    `stats_dir` between runs, tagged with PARTIALS_VERSION, and rebuilt from
+    scratch when the version or the kind of fingerprint differs. Games that
+    disappeared from the inputs are dropped.
+    """
+    if game_hashes is not None:
+        fingerprints = game_hashes.astype({'match': str})
+    else:
+        fingerprints = calculate_game_fingerprints(points_df, passes_df, player_stats_df)
+    fingerprints = fingerprints.assign(partials_version=PARTIALS_VERSION)
+    stored_fingerprints = read_table(stats_dir, 'game-fingerprints')
+    stored_team_partials = read_table(stats_dir, 'team-game-partials')
+    stored_player_partials = read_table(stats_dir, 'player-game-partials')
+
+    if stored_fingerprints is not None and not _can_reuse_partials(fingerprints, stored_fingerprints):
+        stored_fingerprints = None
+
+    if any(df is None for df in [stored_fingerprints, stored_team_partials, stored_player_partials]):
+        changed = fingerprints[GAME_KEYS]
+        kept_team_partials = kept_player_partials = None
+    else:
+        stored_fingerprints = stored_fingerprints.astype({'match': str, 'week': fingerprints['week'].dtype})
+        changed = _changed_games(fingerprints, stored_fingerprints)
+
+        # Keep stored aggregates for games that are unchanged and still present
+        unchanged = fingerprints[GAME_KEYS].merge(changed, how='left', indicator=True)
+        unchanged = unchanged.loc[unchanged['_merge'] == 'left_only', GAME_KEYS]
+        kept_team_partials = _filter_games(stored_team_partials, unchanged)
+        kept_player_partials = _filter_games(stored_player_partials, unchanged)
+
+    if changed.empty and kept_team_partials is not None and len(fingerprints) == len(stored_fingerprints):
+        # Nothing was added, changed or removed: no input rows are touched and nothing is rewritten
+        team_partials, player_partials = kept_team_partials, kept_player_partials
+    else:
+        # Aggregate just the games that changed
+        team_partials, player_partials = calculate_game_partials(
+            _filter_games(points_df, changed),
+            _filter_games(passes_df, changed),
+            _filter_games(player_stats_df, changed)
+        )
+
+        if kept_team_partials is not None:
+            team_partials = pd.concat([kept_team_partials, team_partials], ignore_index=True)
+            player_partials = pd.concat([kept_player_partials, player_partials], ignore_index=True)
+
+        write_table(team_partials, stats_dir, 'team-game-partials', storage_format)
+        write_table(player_partials, stats_dir, 'player-game-partials', storage_format)
+        write_table(fingerprints, stats_dir, 'game-fingerprints', storage_format)
+
+    team_stats_overall, team_stats_game = fold_team_partials(team_partials)
+    player_stats_overall, player_stats_game = fold_player_partials(player_partials)
+    return team_stats_overall, team_stats_game, player_stats_overall, player_stats_game
+
+def main(storage_format: str = STORAGE_FORMAT, export_csv: bool = True, partition_by_week: bool = False,
+         incremental: bool = True, streaming: bool = False, memory_budget_mb: int = DEFAULT_MEMORY_BUDGET_MB):
+    """Process all statistics and save results
+
+    Integrated data is read from its copy in STORAGE_FORMAT, or from the
+    other format only if that copy is missing. Statistics are written in
+    `storage_format`, with CSV copies kept when `export_csv` is set.
+    Per-game tables can be partitioned by week. In `incremental` mode only
+    games that changed since the previous run are re-aggregated;
+    `streaming` mode instead reads the inputs in chunks within
+    `memory_budget_mb`. Possession and point sequences are written alongside
+    except when streaming, as they need each game's passes in one piece.
+    Returns input rows read (None when streaming) and rows written per
+    table; errors are reported and re-raised.
+    """
     # Create stats directory
     os.makedirs('stats', exist_ok=True)
 
+    rows_in = None
+    sequences = {}
     try:
-        # Read integrated data
-        points_df = pd.read_csv('integ-data/Points.csv')
-        passes_df = pd.read_csv('integ-data/Passes.csv')
-        player_stats_df = pd.read_csv('integ-data/Player-Stats.csv')
+        if streaming:
+            # The pass edges behind the statistics also make the pass network, so Passes is read once
+            (team_stats_overall, team_stats_game,
+             player_stats_overall, player_stats_game), pass_edges = _calculate_streaming_with_pass_edges(
+                'integ-data', memory_budget_mb)
+            pass_network = calculate_pass_network(pass_edges)
+        else:
+            # Read integrated data
+            points_df = read_table('integ-data', 'Points')
+            passes_df = read_table('integ-data', 'Passes')
+            player_stats_df = read_table('integ-data', 'Player-Stats')
+            game_hashes = read_table('integ-data', GAME_HASHES_TABLE)
+            rows_in = len(points_df) + len(passes_df) + len(player_stats_df)
 
-        # Calculate team statistics
-        team_stats_overall, team_stats_game = calculate_team_statistics(points_df, passes_df)
+            if incremental:
+                (team_stats_overall, team_stats_game,
+                 player_stats_overall, player_stats_game) = calculate_statistics_incremental(
+                    points_df, passes_df, player_stats_df, 'stats', storage_format, game_hashes)
+            else:
+                (team_stats_overall, team_stats_game,
+                 player_stats_overall, player_stats_game) = calculate_all_statistics(
+                    points_df, passes_df, player_stats_df)
 
-        # Calculate player statistics
-        player_stats_overall, player_stats_game = calculate_player_statistics(player_stats_df, passes_df)
+            pass_network = calculate_pass_network(calculate_pass_edge_partials(passes_df))
+
+            # Reconstruct possession and point sequences from the pass log
+            possessions = build_possessions_table(passes_df)
+            sequences = {'possessions': possessions, 'possession-points': build_points_table(possessions)}
 
         # Save processed statistics
-        team_stats_overall.to_csv('stats/team-stats-overall.csv', index=False)
-        team_stats_game.to_csv('stats/team-stats-game.csv', index=False)
-        player_stats_overall.to_csv('stats/player-stats-overall.csv', index=False)
-        player_stats_game.to_csv('stats/player-stats-game.csv', index=False)
+        game_partitions = ['week'] if partition_by_week and storage_format == 'parquet' else None
+        write_table(team_stats_overall, 'stats', 'team-stats-overall', storage_format, export_csv=export_csv)
+        write_table(team_stats_game, 'stats', 'team-stats-game', storage_format, game_partitions, export_csv)
+        write_table(player_stats_overall, 'stats', 'player-stats-overall', storage_format, export_csv=export_csv)
+        write_table(player_stats_game, 'stats', 'player-stats-game', storage_format, game_partitions, export_csv)
+        write_table(pass_network, 'stats', 'pass-network', storage_format, game_partitions, export_csv)
+        for name, sequence in sequences.items():
+            write_table(sequence, 'stats', name, storage_format, game_partitions, export_csv)
+
+        # Rate only the weeks played since the last run
+        ratings = update_ratings(build_games_view(team_stats_game), 'stats', storage_format)
+
+        # Materialize ready-to-render dashboard views
+        views = build_views(team_stats_overall, team_stats_game, player_stats_overall, player_stats_game,
+                            pass_network, ratings)
+        for name, view in views.items():
+            write_table(view, VIEWS_DIR, name, storage_format)
 
     except Exception as e:
         print(f"Error processing statistics: {str(e)}")
+        raise
+
+    rows_out = {
+        'team-stats-overall': len(team_stats_overall),
+        'team-stats-game': len(team_stats_game),
+        'player-stats-overall': len(player_stats_overall),
+        'player-stats-game': len(player_stats_game),
+        'pass-network': len(pass_network),
+        **{name: len(sequence) for name, sequence in sequences.items()}
+    }
+    return {'rows_in': rows_in, 'rows_out': rows_out}
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,119 @@
+import os
+import json
+import hashlib
+import pyarrow as pa
+import pyarrow.parquet as pq
+from typing import Dict, List, Optional
+from dropbox_utils import compute_content_hash
+
+# Parsed, tagged game files keyed by the content of the raw file
+GAME_CACHE_DIR = "game-cache"
+CACHE_INDEX_NAME = "index.json"
+
+# Part of every cache key; bump it when parsed frames change shape or dtypes
+CACHE_FORMAT_VERSION = 2
+
+def cache_key(content_hash: str, kind: str, game_tags: Dict[str, str]) -> str:
+    """Cache key for a raw file's content plus the tags taken from its path"""
+    parts = [str(CACHE_FORMAT_VERSION), content_hash, kind, str(game_tags['week']), game_tags['match'], game_tags['team']]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+def game_fingerprint(keys: List[str]) -> str:
+    """Fingerprint of a game from the cache keys of its files, whatever order they were listed in"""
+    return hashlib.sha256("|".join(sorted(keys)).encode()).hexdigest()
+
+def cache_entry_path(cache_dir: str, key: str) -> str:
+    """Where a cached frame is stored"""
+    return os.path.join(cache_dir, key + ".parquet")
+
+def file_signature(file_path: str) -> List[float]:
+    """Size and modification time, used to skip re-hashing untouched files"""
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime]
+
+def load_cache_index(cache_dir: str = GAME_CACHE_DIR) -> Dict:
+    """Load the cache index: raw file path -> content hash, signature and cache key"""
+    index_path = os.path.join(cache_dir, CACHE_INDEX_NAME)
+    if not os.path.exists(index_path):
+        return {'files': {}}
+
+    try:
+        with open(index_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'files': {}}
+
+def save_cache_index(index: Dict, cache_dir: str = GAME_CACHE_DIR):
+    """Atomically write the cache index"""
+    os.makedirs(cache_dir, exist_ok=True)
+    index_path = os.path.join(cache_dir, CACHE_INDEX_NAME)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, index_path)
+
+def known_content_hash(index: Dict, file_path: str) -> Optional[str]:
+    """Content hash recorded for a file, if the file hasn't been touched since"""
+    entry = index['files'].get(file_path)
+    if entry is None or not os.path.exists(file_path):
+        return None
+    if entry['signature'] != file_signature(file_path):
+        return None
+    return entry['content_hash']
+
+def file_content_hash(file_path: str, known_hash: Optional[str] = None) -> str:
+    """Content hash of a raw file, reusing a known one when available"""
+    return known_hash or compute_content_hash(file_path)
+
+def read_cached_table(cache_dir: str, key: str) -> Optional[pa.Table]:
+    """Load a cached frame as an Arrow table, or None on a miss"""
+    path = cache_entry_path(cache_dir, key)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pq.read_table(path)
+    except (OSError, ValueError):
+        return None
+
+def write_cached_table(table: pa.Table, cache_dir: str, key: str) -> int:
+    """Store a parsed frame's Arrow table under its key and return its size in bytes"""
+    os.makedirs(cache_dir, exist_ok=True)
+    path = cache_entry_path(cache_dir, key)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+def evict_stale_entries(index: Dict, current_files: List[str], cache_dir: str = GAME_CACHE_DIR) -> Dict[str, int]:
+    """Drop index entries for files that disappeared upstream, and any cached frame no file uses"""
+    current = set(current_files)
+    for file_path in [path for path in index['files'] if path not in current]:
+        del index['files'][file_path]
+
+    live_keys = {entry['key'] for entry in index['files'].values()}
+    evicted = 0
+    evicted_bytes = 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if not name.endswith(".parquet") or name[:-len(".parquet")] in live_keys:
+                continue
+            path = os.path.join(cache_dir, name)
+            evicted += 1
+            evicted_bytes += os.path.getsize(path)
+            os.remove(path)
+
+    return {'evicted': evicted, 'evicted_bytes': evicted_bytes}
+
+def cache_size_bytes(cache_dir: str = GAME_CACHE_DIR) -> int:
+    """Total size of the cached frames"""
+    if not os.path.isdir(cache_dir):
+        return 0
+    return sum(
+        os.path.getsize(os.path.join(cache_dir, name))
+        for name in os.listdir(cache_dir) if name.endswith(".parquet")
+    )
+
+def format_cache_stats(stats: Dict[str, int]) -> str:
+    """One-line cache report"""
+    return (f"Game cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['evicted']} evicted, {stats['bytes'] / 1024 / 1024:.1f} MB cached")
@@ -0,0 +1,138 @@
+import os
+import json
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# One JSON object per pipeline stage, appended as the stages finish
+PIPELINE_METRICS_PATH = os.path.join("stats", "pipeline-metrics.jsonl")
+
+# The metrics file is rotated to a single ".1" backup past this size
+METRICS_MAX_BYTES = 5 * 1024 * 1024
+
+# Runs kept when reading the metrics back
+RECENT_RUNS = 20
+
+def new_run_id() -> str:
+    """Identifier shared by every stage of one pipeline run"""
+    return uuid.uuid4().hex[:12]
+
+def process_peak_rss_bytes() -> Dict[str, Optional[int]]:
+    """Peak resident memory so far of this process and of its finished child processes
+
+    These are high-water marks for the whole process lifetime, so a stage
+    only moves them when it uses more memory than everything before it.
+    """
+    if resource is None:
+        return {'process_peak_rss_bytes': None, 'process_peak_child_rss_bytes': None}
+
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1 if os.uname().sysname == 'Darwin' else 1024
+    return {
+        'process_peak_rss_bytes': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'process_peak_child_rss_bytes': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    }
+
+def current_rss_bytes() -> Optional[int]:
+    """Resident memory of this process right now, or None where /proc isn't available"""
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+def emit_metrics(record: Dict, metrics_path: str = PIPELINE_METRICS_PATH):
+    """Print a metrics record as a JSON line and append it to the metrics file"""
+    line = json.dumps(record, default=str)
+    print(line)
+
+    directory = os.path.dirname(metrics_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    if os.path.exists(metrics_path) and os.path.getsize(metrics_path) > METRICS_MAX_BYTES:
+        os.replace(metrics_path, metrics_path + ".1")
+    with open(metrics_path, "a") as f:
+        f.write(line + "\n")
+
+@contextmanager
+def record_stage(run_id: str, stage: str, metrics_path: str = PIPELINE_METRICS_PATH) -> Iterator[Dict]:
+    """Time a pipeline stage and emit its metrics when it ends
+
+    The stage adds its own counts (rows in and out, bytes downloaded, cache
+    hits) to the yielded dict. Failures are recorded with the error and
+    then re-raised. The memory the stage itself kept is the change in this
+    process's resident memory from start to end; memory freed before the
+    stage ends and memory used by child processes don't show in it.
+    """
+    metrics = {}
+    record = {'run_id': run_id, 'stage': stage, 'started_at': time.time()}
+    rss_at_start = current_rss_bytes()
+    start = time.perf_counter()
+    try:
+        yield metrics
+        record['status'] = 'ok'
+    except Exception as e:
+        record['status'] = 'error'
+        record['error'] = str(e)
+        raise
+    finally:
+        record['wall_time_s'] = round(time.perf_counter() - start, 3)
+        rss_at_end = current_rss_bytes()
+        record['rss_bytes'] = rss_at_end
+        record['rss_delta_bytes'] = rss_at_end - rss_at_start if rss_at_start is not None and rss_at_end is not None else None
+        record.update(process_peak_rss_bytes())
+        record.update(metrics)
+        emit_metrics(record, metrics_path)
+
+def load_pipeline_runs(metrics_path: str = PIPELINE_METRICS_PATH, limit: int = RECENT_RUNS) -> List[Dict]:
+    """Most recent pipeline runs, newest first, each with its stage records in order"""
+    if not os.path.exists(metrics_path):
+        return []
+
+    runs: Dict[str, Dict] = {}
+    with open(metrics_path) as f:
+        # Plenty of lines for `limit` runs of a handful of stages
+        for line in deque(f, maxlen=limit * 10):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            run = runs.setdefault(record['run_id'], {'run_id': record['run_id'], 'stages': []})
+            run['stages'].append(record)
+
+    return list(reversed(list(runs.values())))[:limit]
+
+def summarize_run(run: Dict) -> Dict:
+    """Headline numbers for one run: status, timings, memory, download, cache and schema problem counts"""
+    stages = {record['stage']: record for record in run['stages']}
+    pipeline = stages.get('pipeline', {})
+    failed = [record for record in run['stages'] if record['status'] == 'error']
+    peaks = [record.get('process_peak_rss_bytes') or 0 for record in run['stages']]
+    child_peaks = [record.get('process_peak_child_rss_bytes') or 0 for record in run['stages']]
+
+    return {
+        # Stages are written as they finish, so no pipeline record means still running
+        'status': pipeline.get('status', 'running'),
+        'started_at': min(record['started_at'] for record in run['stages']),
+        'finished_at': pipeline['started_at'] + pipeline['wall_time_s'] if pipeline else None,
+        'wall_time_s': pipeline.get('wall_time_s'),
+        'stage_times_s': {stage: record['wall_time_s'] for stage, record in stages.items() if stage != 'pipeline'},
+        'stage_rss_delta_bytes': {stage: record.get('rss_delta_bytes') for stage, record in stages.items() if stage != 'pipeline'},
+        'process_peak_rss_bytes': max(peaks, default=0),
+        'process_peak_child_rss_bytes': max(child_peaks, default=0),
+        'bytes_downloaded': stages.get('download', {}).get('bytes_downloaded'),
+        'cache_hits': stages.get('integrate', {}).get('cache_hits'),
+        'cache_misses': stages.get('integrate', {}).get('cache_misses'),
+        'schema_problems': stages.get('integrate', {}).get('schema_problems'),
+        'schema_problem_examples': stages.get('integrate', {}).get('schema_problem_examples', []),
+        'rows_out': stages.get('stats', {}).get('rows_out'),
+        'error': failed[0].get('error') if failed else None
+    }
@@ -1,18 +1,45 @@
 import os
 from data_processing.process_game_data import process_dropbox_game_files, integrate_raw_game_data
 from data_processing.calculate_statistics import main as calculate_stats
+from data_processing.instrumentation import new_run_id, record_stage, PIPELINE_METRICS_PATH
 
-def process_dropbox_data(dropbox_folder: str = "/2024_game_day_info"):
-    """Process game data from Dropbox folder"""
-    # Step 1: Process raw game data
-    print("Processing raw game data from Dropbox...")
-    local_dir = process_dropbox_game_files(dropbox_folder, "game_day_info")
+def process_dropbox_data(dropbox_folder: str = "/2024_game_day_info", metrics_path: str = PIPELINE_METRICS_PATH):
+    """Process game data from Dropbox folder
 
-    # Step 2: Process the downloaded data
-    integrate_raw_game_data(None, "integ-data", local_dir)  # Pass None for zip_path
+    Each stage, and the run as a whole, emits a JSON metrics line to `metrics_path`.
+    """
+    run_id = new_run_id()
+    with record_stage(run_id, 'pipeline', metrics_path):
+        # Step 1: Process raw game data
+        print("Processing raw game data from Dropbox...")
+        with record_stage(run_id, 'download', metrics_path) as metrics:
+            sync = process_dropbox_game_files(dropbox_folder, "game_day_info")
+            metrics.update(
+                files_downloaded=len(sync['downloaded']),
+                files_deleted=len(sync['deleted']),
+                bytes_downloaded=sync['bytes_downloaded'],
+                files_out=len(sync['files'])
+            )
 
-    # Step 3: Calculate statistics
-    print("Calculating season statistics...")
-    calculate_stats()
+        # Step 2: Process the downloaded data
+        with record_stage(run_id, 'integrate', metrics_path) as metrics:
+            integration = integrate_raw_game_data(None, "integ-data", "game_day_info")  # Pass None for zip_path
+            metrics.update(
+                files_in=integration['files'],
+                files_skipped=len(integration['skipped_files']),
+                rows_out=sum(integration['rows'].values()),
+                cache_hits=integration['cache']['hits'],
+                cache_misses=integration['cache']['misses'],
+                cache_bytes=integration['cache']['bytes'],
+                schema_problems=len(integration['schema_problems']),
+                # A few examples are enough to find the offending files
+                schema_problem_examples=integration['schema_problems'][:5]
+            )
+
+        # Step 3: Calculate statistics
+        print("Calculating season statistics...")
+        with record_stage(run_id, 'stats', metrics_path) as metrics:
+            results = calculate_stats()
+            metrics.update(rows_in=results['rows_in'], rows_out=sum(results['rows_out'].values()))
 
     print("Data processing complete!")
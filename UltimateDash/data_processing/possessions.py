@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+from typing import Dict
+from data_processing.schema import START_Y_COLUMN, END_Y_COLUMN
+from data_processing.advanced_metrics import in_red_zone
+
+# Keys every segmented possession and point carries
+GAME_SIDE_KEYS = ['team', 'match', 'week']
+
+# How a possession ended: the team scored, gave the disc up, or the log stops
+# mid-possession (end of a period, or the opponent scored after a block)
+OUTCOME_GOAL = 'goal'
+OUTCOME_TURNOVER = 'turnover'
+OUTCOME_OPEN = 'open'
+
+POSSESSION_COLUMNS = GAME_SIDE_KEYS + [
+    'Point', 'Possession', 'passes', 'completions', 'yards_gained',
+    'start_y', 'end_y', 'red_zone_passes', 'outcome'
+]
+POINT_COLUMNS = GAME_SIDE_KEYS + ['Point', 'possessions', 'passes', 'yards_gained', 'start_y', 'scored', 'turnovers']
+
+def _run_starts(codes: np.ndarray) -> np.ndarray:
+    """Flag rows whose value differs from the row before; the first row always starts a run"""
+    starts = np.ones(len(codes), dtype=bool)
+    starts[1:] = codes[1:] != codes[:-1]
+    return starts
+
+def _key_starts(df: pd.DataFrame, columns) -> np.ndarray:
+    """Flag rows where any of `columns` changes from the row before"""
+    starts = np.zeros(len(df), dtype=bool)
+    for column in columns:
+        starts |= _run_starts(pd.factorize(df[column])[0])
+    return starts
+
+def _flag(passes_df: pd.DataFrame, column: str) -> np.ndarray:
+    """A 0/1 pass flag as a bool array, all False when the log doesn't have it"""
+    if column not in passes_df.columns:
+        return np.zeros(len(passes_df), dtype=bool)
+    return passes_df[column].to_numpy() == 1
+
+def _number_within(starts: np.ndarray, group_starts: np.ndarray) -> np.ndarray:
+    """Number runs 1, 2, ... from each group start, given both as row flags"""
+    run_number = np.cumsum(starts)
+    first_in_group = np.maximum.accumulate(np.where(group_starts, run_number, 0))
+    return run_number - first_in_group + 1
+
+def _numbers(passes_df: pd.DataFrame, column: str, starts: np.ndarray, group_starts: np.ndarray) -> np.ndarray:
+    """The log's own numbers for `column`, or runs numbered from each group start"""
+    if column in passes_df.columns:
+        return passes_df[column].to_numpy()
+    return _number_within(starts, group_starts)
+
+def segment_passes(passes_df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Point and possession boundaries of a pass log, as row flags and numbers
+
+    Passes must be in the order they were thrown within each team's game, as
+    the game files list them. Point and possession numbers from the log are
+    kept when present, so slices of one log number them alike. Otherwise a
+    point ends when the team scores and a possession when it turns the disc
+    over, counting from 1 at the start of the slice; a point the opponent
+    wins after a block then runs into the next one.
+    """
+    # Step 1: A new game side starts wherever the team, match or week changes
+    game_starts = _key_starts(passes_df, GAME_SIDE_KEYS)
+
+    # Step 2: Points start on a new game side, a new point number or after a goal
+    assist = _flag(passes_df, 'Assist?')
+    turnover = _flag(passes_df, 'Turnover?')
+    if 'Point' in passes_df.columns:
+        point_starts = game_starts | _run_starts(passes_df['Point'].to_numpy())
+    else:
+        point_starts = game_starts.copy()
+        point_starts[1:] |= assist[:-1]
+
+    # Step 3: Possessions start with a point, a new possession number or after a turnover
+    if 'Possession' in passes_df.columns:
+        possession_starts = point_starts | _run_starts(passes_df['Possession'].to_numpy())
+    else:
+        possession_starts = point_starts.copy()
+        possession_starts[1:] |= turnover[:-1]
+
+    return {
+        'point_starts': point_starts,
+        'possession_starts': possession_starts,
+        'point': _numbers(passes_df, 'Point', point_starts, game_starts),
+        'possession': _numbers(passes_df, 'Possession', possession_starts, point_starts),
+        'assist': assist,
+        'turnover': turnover
+    }
+
+def _position(passes_df: pd.DataFrame, column: str) -> np.ndarray:
+    """Field positions of the passes, NaN when the log has none"""
+    if column not in passes_df.columns:
+        return np.full(len(passes_df), np.nan)
+    return passes_df[column].to_numpy('float64')
+
+def build_possessions_table(passes_df: pd.DataFrame) -> pd.DataFrame:
+    """One row per possession: length, yards gained, start and end field position, outcome
+
+    Yards gained add up the forward distance of completed passes. Field
+    positions run from 0 at the back of the attacking end zone to 1 at the
+    back of the team's own; they are missing when the log has no positions.
+    """
+    if passes_df.empty:
+        return pd.DataFrame(columns=POSSESSION_COLUMNS)
+
+    segments = segment_passes(passes_df)
+    starts = np.flatnonzero(segments['possession_starts'])
+    ends = np.append(starts[1:], len(passes_df)) - 1
+
+    # Every possession is a contiguous run of rows, so sums are reductions over the runs
+    completed = ~segments['turnover']
+    distance = np.nan_to_num(passes_df['Forward distance (yd)'].to_numpy('float64'))
+    red_zone = in_red_zone(passes_df).to_numpy()
+
+    outcome = np.where(segments['assist'][ends], OUTCOME_GOAL,
+                       np.where(segments['turnover'][ends], OUTCOME_TURNOVER, OUTCOME_OPEN))
+
+    possessions = passes_df[GAME_SIDE_KEYS].iloc[starts].reset_index(drop=True)
+    possessions['Point'] = segments['point'][starts]
+    possessions['Possession'] = segments['possession'][starts]
+    possessions['passes'] = ends - starts + 1
+    possessions['completions'] = np.add.reduceat(completed.astype('int64'), starts)
+    possessions['yards_gained'] = np.add.reduceat(np.where(completed, distance, 0), starts)
+    possessions['start_y'] = _position(passes_df, START_Y_COLUMN)[starts]
+    possessions['end_y'] = _position(passes_df, END_Y_COLUMN)[ends]
+    possessions['red_zone_passes'] = np.add.reduceat(red_zone.astype('int64'), starts)
+    possessions['outcome'] = pd.Categorical(outcome, categories=[OUTCOME_GOAL, OUTCOME_TURNOVER, OUTCOME_OPEN])
+    return possessions
+
+def build_points_table(possessions: pd.DataFrame) -> pd.DataFrame:
+    """One row per point a team had the disc in, rolled up from its possessions"""
+    if possessions.empty:
+        return pd.DataFrame(columns=POINT_COLUMNS)
+
+    # Possessions of a point are contiguous
+    starts = np.flatnonzero(_key_starts(possessions, GAME_SIDE_KEYS + ['Point']))
+    ends = np.append(starts[1:], len(possessions)) - 1
+    outcome = possessions['outcome'].to_numpy()
+
+    points = possessions[GAME_SIDE_KEYS + ['Point']].iloc[starts].reset_index(drop=True)
+    points['possessions'] = ends - starts + 1
+    points['passes'] = np.add.reduceat(possessions['passes'].to_numpy(), starts)
+    points['yards_gained'] = np.add.reduceat(possessions['yards_gained'].to_numpy(), starts)
+    points['start_y'] = possessions['start_y'].to_numpy()[starts]
+    points['scored'] = outcome[ends] == OUTCOME_GOAL
+    points['turnovers'] = np.add.reduceat((outcome == OUTCOME_TURNOVER).astype('int64'), starts)
+    return points
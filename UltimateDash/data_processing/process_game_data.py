@@ -1,15 +1,36 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
 import os
 import re
 import zipfile
-from typing import Dict, List, Tuple
-from dropbox_utils import download_folder_files
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+from dropbox_utils import sync_folder_files, DEFAULT_DOWNLOAD_WORKERS
+from data_processing.storage import write_table, STORAGE_FORMAT
+from data_processing.schema import apply_schema, validate_table, concat_tables, GAME_HASHES_TABLE, TAG_DTYPES
+from data_processing.game_cache import (
+    GAME_CACHE_DIR, cache_key, file_signature, load_cache_index, save_cache_index, known_content_hash,
+    file_content_hash, read_cached_table, write_cached_table, evict_stale_entries, cache_size_bytes,
+    format_cache_stats, game_fingerprint
+)
 
-def process_dropbox_game_files(dropbox_folder_path: str = "/2024_game_day_info", local_dir: str = "game_day_info"):
-    """Process game files from Dropbox folder"""
-    # Download all files from Dropbox
-    downloaded_files = download_folder_files(dropbox_folder_path, local_dir)
-    return local_dir
+# Integrated tables, and the file name suffixes that identify their game files,
+# which are named `<Team> <suffix>.csv`
+GAME_FILE_KINDS = {
+    'Passes': 'passes',
+    'Player-Stats': 'player-stats',
+    'Points': 'points'
+}
+
+def process_dropbox_game_files(dropbox_folder_path: str = "/2024_game_day_info", local_dir: str = "game_day_info",
+                               max_workers: int = DEFAULT_DOWNLOAD_WORKERS, dbx=None) -> Dict:
+    """Process game files from Dropbox folder
+
+    Returns the sync result: files downloaded, deleted and mirrored, and bytes downloaded.
+    """
+    # Download new and changed files from Dropbox in parallel
+    return sync_folder_files(dropbox_folder_path, local_dir, dbx=dbx, max_workers=max_workers)
 
 def identify_game_info(file_path: str) -> Dict[str, str]:
     """Extract game information from file path and name"""
@@ -31,4 +52,208 @@ def identify_game_info(file_path: str) -> Dict[str, str]:
         'file_path': file_path
     }
 
-# Rest of your code remains the same
+def identify_file_kind(file_path: str) -> Optional[str]:
+    """Which integrated table a game file belongs to, from its name's suffix, if any"""
+    name = os.path.basename(file_path).lower()
+    for kind, suffix in GAME_FILE_KINDS.items():
+        if name.endswith(f" {suffix}.csv"):
+            return kind
+    return None
+
+def identify_file_team(file_path: str, game_info: Dict[str, str]) -> Optional[str]:
+    """Team whose stats a game file holds, named before its suffix, or None if it is neither team in the match"""
+    kind = identify_file_kind(file_path)
+    if kind is None:
+        return None
+    name = os.path.basename(file_path)
+    prefix = name[:-len(f" {GAME_FILE_KINDS[kind]}.csv")].strip().lower()
+    for team in [game_info['team1'], game_info['team2']]:
+        if team and team.lower() == prefix:
+            return team
+    return None
+
+def game_file_tags(file_path: str) -> Optional[Dict[str, str]]:
+    """Table kind plus the week, match and team tags for a game file, or None if it isn't one
+
+    Files whose team can't be told from their name aren't game files either,
+    rather than being credited to a team that may not be theirs.
+    """
+    kind = identify_file_kind(file_path)
+    game_info = identify_game_info(file_path)
+    if kind is None or not (game_info['week'] and game_info['team1'] and game_info['team2']):
+        return None
+    team = identify_file_team(file_path, game_info)
+    if team is None:
+        return None
+
+    return {
+        'kind': kind,
+        'week': int(game_info['week']),
+        'match': f"{game_info['team1']} @ {game_info['team2']}",
+        'team': team
+    }
+
+def parse_game_file(file_path: str) -> Tuple[Optional[str], Optional[pd.DataFrame]]:
+    """Read one game file and tag its rows with week, match and team
+
+    Returns (None, None) for files that aren't game files.
+    """
+    tags = game_file_tags(file_path)
+    if tags is None:
+        return None, None
+
+    df = pd.read_csv(file_path)
+    # Tags go in already typed, as a single category each, in one step
+    codes = np.zeros(len(df), dtype=np.int8)
+    tag_columns = pd.DataFrame({
+        'week': pd.array(np.full(len(df), tags['week']), dtype=TAG_DTYPES['week']),
+        'match': pd.Categorical.from_codes(codes, [tags['match']]),
+        'team': pd.Categorical.from_codes(codes, [tags['team']])
+    })
+    return tags['kind'], pd.concat([df, tag_columns], axis=1)
+
+def parse_game_file_cached(file_path: str, known_hash: Optional[str] = None,
+                           cache_dir: str = GAME_CACHE_DIR) -> Dict:
+    """Parse and type a game file, or load it from the content-addressed cache
+
+    Each file takes its table's compact dtypes as soon as it is read, so
+    frames are small in the cache and while the season is put together.
+    The file comes back as an Arrow table, ready to be concatenated.
+    Schema problems are found before typing; a cache hit has none, as they
+    were recorded when the file was first parsed. Runs in worker processes,
+    so it only takes and returns picklable values.
+    """
+    tags = game_file_tags(file_path)
+    content_hash = file_content_hash(file_path, known_hash)
+    key = cache_key(content_hash, tags['kind'], tags)
+
+    table = read_cached_table(cache_dir, key)
+    hit = table is not None
+    problems = None
+    if not hit:
+        _, df = parse_game_file(file_path)
+        problems = [f"{os.path.basename(file_path)}: {problem}" for problem in validate_table(df, tags['kind'])]
+        table = pa.Table.from_pandas(apply_schema(df, tags['kind']), preserve_index=False)
+        write_cached_table(table, cache_dir, key)
+
+    return {
+        'file_path': file_path,
+        'content_hash': content_hash,
+        'key': key,
+        'kind': tags['kind'],
+        'week': tags['week'],
+        'match': tags['match'],
+        'table': table,
+        'hit': hit,
+        'problems': problems
+    }
+
+def build_game_hashes(parsed: List[Dict]) -> pd.DataFrame:
+    """One fingerprint per game from the content-addressed keys of its files
+
+    Statistics use these to find changed games without hashing any rows.
+    """
+    game_keys: Dict[Tuple[str, int], List[str]] = {}
+    for result in parsed:
+        game_keys.setdefault((result['match'], result['week']), []).append(result['key'])
+
+    game_hashes = pd.DataFrame({
+        'match': [match for match, _ in game_keys],
+        'week': [week for _, week in game_keys],
+        'fingerprint_files': [game_fingerprint(keys) for keys in game_keys.values()]
+    })
+    return game_hashes.astype({'week': TAG_DTYPES['week']})
+
+def find_game_files(local_dir: str) -> List[str]:
+    """All CSV files below a local game data folder"""
+    game_files = []
+    for root, _, files in os.walk(local_dir):
+        for name in sorted(files):
+            if name.endswith('.csv'):
+                game_files.append(os.path.join(root, name))
+    return sorted(game_files)
+
+def integrate_raw_game_data(zip_path: Optional[str], output_dir: str = "integ-data", local_dir: str = "game_day_info",
+                            max_workers: Optional[int] = None, storage_format: str = STORAGE_FORMAT,
+                            cache_dir: str = GAME_CACHE_DIR) -> Dict:
+    """Combine every game's Points, Passes and Player-Stats files into season-wide tables
+
+    Files are parsed in a process pool (`max_workers` processes, all cores by
+    default; 1 parses in this process) and each table is concatenated once.
+    Parsed files are cached by content in `cache_dir`, so only new or
+    modified files are parsed; cache entries for files that disappeared are
+    evicted. A fingerprint per game, built from the cache keys, is written as
+    the Game-Hashes table. CSV files that can't be told apart as a team's
+    Points, Passes or Player-Stats file are skipped and reported. Returns the
+    number of game files, the skipped files, rows written per table, the
+    cache statistics and the schema problems of every file still present,
+    including ones first found on an earlier run.
+    """
+    # Unpack an exported archive over the local folder first
+    if zip_path:
+        with zipfile.ZipFile(zip_path) as archive:
+            archive.extractall(local_dir)
+
+    game_files = []
+    skipped_files = []
+    for path in find_game_files(local_dir):
+        (game_files if game_file_tags(path) else skipped_files).append(path)
+    for path in skipped_files:
+        print(f"Skipping {path}: not a Points, Passes or Player-Stats file of a team in its match")
+
+    index = load_cache_index(cache_dir)
+    known_hashes = [known_content_hash(index, path) for path in game_files]
+    cache_dirs = [cache_dir] * len(game_files)
+
+    if max_workers == 1 or len(game_files) <= 1:
+        parsed = list(map(parse_game_file_cached, game_files, known_hashes, cache_dirs))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            parsed = list(executor.map(parse_game_file_cached, game_files, known_hashes, cache_dirs, chunksize=8))
+
+    tables = {kind: [] for kind in GAME_FILE_KINDS}
+    schema_problems = []
+    for result in parsed:
+        tables[result['kind']].append(result['table'])
+        previous = index['files'].get(result['file_path'], {})
+        problems = result['problems']
+        if problems is None:
+            problems = previous.get('problems', []) if previous.get('key') == result['key'] else []
+        schema_problems.extend(problems)
+        index['files'][result['file_path']] = {
+            'content_hash': result['content_hash'],
+            'signature': file_signature(result['file_path']),
+            'key': result['key'],
+            'problems': problems
+        }
+
+    cache_stats = evict_stale_entries(index, game_files, cache_dir)
+    save_cache_index(index, cache_dir)
+    cache_stats.update({
+        'hits': sum(result['hit'] for result in parsed),
+        'misses': sum(not result['hit'] for result in parsed),
+        'bytes': cache_size_bytes(cache_dir)
+    })
+    print(format_cache_stats(cache_stats))
+
+    row_counts = {}
+    for kind, kind_tables in tables.items():
+        if not kind_tables:
+            continue
+        # Files are typed already; this only re-types columns some files lack or widen
+        integrated = apply_schema(concat_tables(kind_tables), kind)
+        write_table(integrated, output_dir, kind, storage_format)
+        row_counts[kind] = len(integrated)
+
+    write_table(build_game_hashes(parsed), output_dir, GAME_HASHES_TABLE, storage_format)
+
+    for problem in schema_problems:
+        print(f"Schema problem: {problem}")
+
+    return {
+        'files': len(game_files),
+        'skipped_files': skipped_files,
+        'rows': row_counts,
+        'cache': cache_stats,
+        'schema_problems': schema_problems
+    }
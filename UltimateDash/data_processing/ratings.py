@@ -0,0 +1,165 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from data_processing.storage import read_table, write_table, STORAGE_FORMAT
+
+# Elo-style power ratings: every team starts level, and a game moves both
+# teams by K times how much the result beat expectation, scaled up for wider
+# margins. Each week is one rating period: its games are all rated against
+# the ratings the week started with.
+INITIAL_RATING = 1500.0
+K_FACTOR = 16.0
+RATING_SCALE = 400.0
+
+RATED_GAME_COLUMNS = ['match', 'week', 'team1', 'team2', 'team1_score', 'team2_score']
+RATING_STATE_COLUMNS = ['team', 'rating', 'games_rated']
+
+def rated_games(games_df: pd.DataFrame) -> pd.DataFrame:
+    """Games with both scores known, in week order, as the ratings see them"""
+    games = games_df.dropna(subset=['team1_score', 'team2_score'])[RATED_GAME_COLUMNS]
+    games = games.astype({'match': str, 'team1': str, 'team2': str, 'week': int,
+                          'team1_score': float, 'team2_score': float})
+    return games.sort_values(['week', 'match'], kind='stable').reset_index(drop=True)
+
+def initial_state(teams: List[str]) -> pd.DataFrame:
+    """Every team at the starting rating with no games rated"""
+    return pd.DataFrame({'team': teams, 'rating': INITIAL_RATING, 'games_rated': 0})
+
+def apply_games(state: pd.DataFrame, games: pd.DataFrame) -> pd.DataFrame:
+    """Rate `games` on top of a rating state, one week at a time
+
+    Within a week every game is computed from the same starting ratings and
+    the changes are added at once, so a week is a handful of array
+    operations however many games it has.
+    """
+    teams = list(state['team']) + sorted((set(games['team1']) | set(games['team2'])) - set(state['team']))
+    codes = {team: i for i, team in enumerate(teams)}
+    ratings = np.full(len(teams), INITIAL_RATING)
+    ratings[:len(state)] = state['rating'].to_numpy()
+    games_rated = np.zeros(len(teams), dtype=int)
+    games_rated[:len(state)] = state['games_rated'].to_numpy()
+
+    team1 = games['team1'].map(codes).to_numpy()
+    team2 = games['team2'].map(codes).to_numpy()
+    margin = (games['team1_score'] - games['team2_score']).to_numpy()
+    result = np.sign(margin) / 2 + 0.5
+    multiplier = np.log1p(np.abs(margin)) + 1
+
+    # Games are in week order, so each week is one contiguous slice
+    weeks = games['week'].to_numpy()
+    bounds = np.flatnonzero(np.diff(weeks)) + 1
+    for start, stop in zip(np.r_[0, bounds], np.r_[bounds, len(games)]):
+        t1, t2 = team1[start:stop], team2[start:stop]
+        expected = 1 / (1 + 10 ** ((ratings[t2] - ratings[t1]) / RATING_SCALE))
+        change = K_FACTOR * multiplier[start:stop] * (result[start:stop] - expected)
+        np.add.at(ratings, t1, change)
+        np.add.at(ratings, t2, -change)
+
+    np.add.at(games_rated, team1, 1)
+    np.add.at(games_rated, team2, 1)
+    return pd.DataFrame({'team': teams, 'rating': ratings, 'games_rated': games_rated})
+
+def calculate_ratings(games_df: pd.DataFrame) -> pd.DataFrame:
+    """Ratings of every team from all games, starting level"""
+    return apply_games(initial_state([]), rated_games(games_df))
+
+def update_ratings(games_df: pd.DataFrame, stats_dir: str = 'stats',
+                   storage_format: str = STORAGE_FORMAT) -> pd.DataFrame:
+    """Apply only the weeks after the last rated one to the stored ratings
+
+    The rating state and the games it covers are stored in `stats_dir`. If
+    any game in an already rated week was added, changed or removed, every
+    game is rated again from the start.
+    """
+    games = rated_games(games_df)
+    state = read_table(stats_dir, 'rating-state')
+    stored_games = read_table(stats_dir, 'rated-games')
+
+    if state is None or stored_games is None or stored_games.empty:
+        state, new_games = initial_state([]), games
+    else:
+        stored_games = rated_games(stored_games)
+        last_week = stored_games['week'].max()
+        rated_weeks = games[games['week'] <= last_week].reset_index(drop=True)
+        if rated_weeks.equals(stored_games):
+            state = state.astype({'team': str})[RATING_STATE_COLUMNS]
+            new_games = games[games['week'] > last_week]
+        else:
+            state, new_games = initial_state([]), games
+
+    state = apply_games(state, new_games)
+    write_table(state, stats_dir, 'rating-state', storage_format)
+    write_table(games, stats_dir, 'rated-games', storage_format)
+    return state
+
+def head_to_head(games: pd.DataFrame, teams: List[str]) -> Dict[str, np.ndarray]:
+    """Head-to-head wins, games and point differential between every pair of teams
+
+    `games` are rated games. Entry [i, j] is from team i's side against
+    team j, in the order of `teams`.
+    """
+    codes = {team: i for i, team in enumerate(teams)}
+    games = games[games['team1'].isin(codes) & games['team2'].isin(codes)]
+    team1 = games['team1'].map(codes).to_numpy()
+    team2 = games['team2'].map(codes).to_numpy()
+    margin = (games['team1_score'] - games['team2_score']).to_numpy()
+
+    matrices = {name: np.zeros((len(teams), len(teams))) for name in ['wins', 'games', 'point_differential']}
+    np.add.at(matrices['wins'], (team1, team2), margin > 0)
+    np.add.at(matrices['wins'], (team2, team1), margin < 0)
+    np.add.at(matrices['games'], (team1, team2), 1)
+    np.add.at(matrices['games'], (team2, team1), 1)
+    np.add.at(matrices['point_differential'], (team1, team2), margin)
+    np.add.at(matrices['point_differential'], (team2, team1), -margin)
+    return matrices
+
+def strength_of_schedule(matrices: Dict[str, np.ndarray], team_ratings: np.ndarray) -> np.ndarray:
+    """Mean rating of the opponents each team played, counting repeat meetings"""
+    games_played = matrices['games'].sum(axis=1)
+    total = matrices['games'] @ team_ratings
+    return np.divide(total, games_played, out=np.full(len(team_ratings), np.nan), where=games_played > 0)
+
+def tiebreakers(win_percentage: np.ndarray, matrices: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Head-to-head record and point differential of each team against the teams it is tied with
+
+    Teams without a game against the rest of their tie get a neutral .500.
+    """
+    tied = win_percentage[:, None] == win_percentage[None, :]
+    np.fill_diagonal(tied, False)
+    wins = (matrices['wins'] * tied).sum(axis=1)
+    games = (matrices['games'] * tied).sum(axis=1)
+    return {
+        'head_to_head_pct': np.divide(wins, games, out=np.full(len(wins), 0.5), where=games > 0),
+        'head_to_head_diff': (matrices['point_differential'] * tied).sum(axis=1)
+    }
+
+def rank_standings(standings: pd.DataFrame, games_df: pd.DataFrame,
+                   ratings: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """Order standings by win percentage, breaking ties by head-to-head record,
+    head-to-head point differential, overall point differential and rating
+
+    Adds the tiebreak values, rating and strength of schedule, and a rank.
+    """
+    games = rated_games(games_df)
+    if ratings is None:
+        ratings = apply_games(initial_state([]), games)
+
+    teams = standings['team'].astype(str).tolist()
+    matrices = head_to_head(games, teams)
+    team_ratings = ratings.set_index('team')['rating'].reindex(teams, fill_value=INITIAL_RATING).to_numpy()
+    standings = standings.assign(
+        **tiebreakers(standings['win_percentage'].to_numpy(), matrices),
+        rating=team_ratings,
+        strength_of_schedule=strength_of_schedule(matrices, team_ratings)
+    )
+
+    order = np.lexsort([
+        -standings['rating'].to_numpy(),
+        -standings['point_differential'].to_numpy(),
+        -standings['head_to_head_diff'].to_numpy(),
+        -standings['head_to_head_pct'].to_numpy(),
+        -standings['win_percentage'].to_numpy()
+    ])
+    standings = standings.iloc[order].reset_index(drop=True)
+    standings.insert(0, 'rank', np.arange(1, len(standings) + 1))
+    return standings
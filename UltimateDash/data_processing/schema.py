@@ -0,0 +1,185 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+from typing import Dict, List
+
+# Tags added to every game file row during integration
+TAG_DTYPES = {
+    'week': 'Int16',
+    'match': 'category',
+    'team': 'category'
+}
+
+# Per-game content fingerprints, written next to the integrated tables
+GAME_HASHES_TABLE = 'Game-Hashes'
+
+# Pass positions run from 0 at the back of the attacking end zone to 1 at the
+# back of the team's own, over a field that includes both end zones
+FIELD_LENGTH_YD = 110
+ENDZONE_DEPTH_YD = 20
+START_Y_COLUMN = 'Start Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+END_Y_COLUMN = 'End Y (0 -> 1 = back of opponent endzone -> back of own endzone)'
+
+# Columns of each integrated table and their in-memory dtypes. Flags are
+# bools, counts the smallest integer that holds a single game, yardages float32.
+TABLE_SCHEMAS = {
+    'Points': {
+        'Point': 'int16',
+        'Started on offense?': 'bool',
+        'Scored?': 'bool',
+        'Possessions': 'int16',
+        'Passes': 'int16',
+        'Turnovers': 'int8',
+        'Defensive blocks': 'int8'
+    },
+    'Passes': {
+        'Point': 'int16',
+        'Possession': 'int16',
+        'Thrower': 'category',
+        'Receiver': 'category',
+        'Turnover?': 'bool',
+        'Assist?': 'bool',
+        'Huck?': 'bool',
+        'Forward distance (yd)': 'float32',
+        START_Y_COLUMN: 'float32',
+        END_Y_COLUMN: 'float32'
+    },
+    'Player-Stats': {
+        'Player': 'category',
+        'Touches': 'int16',
+        'Throws': 'int16',
+        'Catches': 'int16',
+        'Defensive blocks': 'int8',
+        'Goals': 'int8',
+        'Turnovers': 'int8',
+        'Total completed throw gain (yd)': 'float32',
+        'Total caught pass gain (yd)': 'float32',
+        'Offense points played': 'int16',
+        'Defense points played': 'int16',
+        'Possessions initiated': 'int16',
+        'Assists': 'int8'
+    }
+}
+
+# Columns the statistics can't be computed without
+REQUIRED_COLUMNS = {
+    'Points': ['Started on offense?', 'Scored?', 'Turnovers', 'Defensive blocks'],
+    'Passes': ['Thrower', 'Receiver', 'Turnover?', 'Huck?', 'Forward distance (yd)'],
+    'Player-Stats': ['Player', 'Touches', 'Throws', 'Catches', 'Defensive blocks', 'Goals', 'Turnovers',
+                     'Total completed throw gain (yd)', 'Total caught pass gain (yd)',
+                     'Offense points played', 'Defense points played', 'Possessions initiated', 'Assists']
+}
+
+# Text columns stored as categoricals in every table
+CATEGORICAL_COLUMNS = ['team', 'match', 'Player', 'Thrower', 'Receiver']
+
+def table_dtypes(name: str) -> Dict[str, str]:
+    """Declared dtypes of a table's game file columns plus the tags"""
+    return {**TABLE_SCHEMAS[name], **TAG_DTYPES}
+
+def _fits(values, dtype: str) -> bool:
+    """Whether every value is within the range of an integer dtype"""
+    limits = np.iinfo(dtype)
+    return len(values) == 0 or (values.min() >= limits.min and values.max() <= limits.max)
+
+def _is_plain_numeric(values: pd.Series) -> bool:
+    """Whether the parser already read a column as plain numbers or flags, with nothing to coerce"""
+    return isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biuf'
+
+def validate_table(df: pd.DataFrame, name: str) -> List[str]:
+    """Problems that would stop a table from taking its declared dtypes
+
+    Reports missing required columns, non-numeric values in numeric columns
+    and counts too large for their integer type.
+    """
+    problems = [f"{name}: missing column '{col}'" for col in REQUIRED_COLUMNS[name] if col not in df.columns]
+
+    for col, dtype in TABLE_SCHEMAS[name].items():
+        if col not in df.columns or dtype == 'category':
+            continue
+        column = df[col]
+        if _is_plain_numeric(column):
+            values = column.to_numpy()
+            values = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+        else:
+            coerced = pd.to_numeric(column, errors='coerce')
+            invalid = int((coerced.isna() & column.notna()).sum())
+            if invalid:
+                problems.append(f"{name}: {invalid} non-numeric values in '{col}'")
+            values = coerced.dropna().to_numpy()
+        if dtype.startswith('int') and not _fits(values, dtype):
+            problems.append(f"{name}: '{col}' has values outside the {dtype} range")
+
+    return problems
+
+def _cast_numeric(values: np.ndarray, dtype: str) -> np.ndarray:
+    """Cast a plain numeric array to a declared flag, count or float dtype"""
+    if dtype == 'bool':
+        return np.nan_to_num(values) != 0
+    if dtype.startswith('int'):
+        values = np.nan_to_num(values).astype('int64')
+        return values.astype(dtype) if _fits(values, dtype) else values
+    return values.astype(dtype)
+
+def _cast(values: pd.Series, dtype: str):
+    """A column cast to its declared dtype"""
+    if dtype == 'category':
+        return values.astype('category')
+    if dtype == 'Int16':
+        return pd.to_numeric(values.astype(str) if isinstance(values.dtype, pd.CategoricalDtype) else values,
+                             errors='coerce').astype('Int16')
+    if _is_plain_numeric(values):
+        return _cast_numeric(values.to_numpy(), dtype)
+    return _cast_numeric(pd.to_numeric(values, errors='coerce').to_numpy('float64'), dtype)
+
+def apply_schema(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """Cast a table's known columns to their declared dtypes
+
+    Blank flags and counts mean zero. Counts that don't fit their declared
+    type keep a wider one rather than wrapping around. Unknown columns are
+    left as they are, and columns already at their declared dtype aren't
+    copied. Columns the parser read as numbers are cast on their arrays, so
+    typing a single game file stays cheap.
+    """
+    dtypes = df.dtypes
+    casts = {
+        col: _cast(df[col], dtype) for col, dtype in table_dtypes(name).items()
+        if col in dtypes.index and dtypes[col] != dtype
+    }
+    return df.assign(**casts) if casts else df
+
+def concat_tables(tables: List[pa.Table]) -> pd.DataFrame:
+    """Concatenate typed tables of one table kind into a single frame
+
+    The tables are joined in Arrow and converted once, so categorical
+    columns come back with the sorted union of every file's categories. Column
+    types are widened where files disagree, and columns some files lack are
+    missing in their rows. A categorical column with no values in a file
+    carries no category type of its own, so it takes the one the other
+    files use.
+    """
+    dictionary_types = {}
+    for table in tables:
+        for field, column in zip(table.schema, table.columns):
+            if pa.types.is_dictionary(field.type) and column.null_count < len(column):
+                dictionary_types.setdefault(field.name, field.type)
+
+    aligned = []
+    for table in tables:
+        for i, field in enumerate(table.schema):
+            target = dictionary_types.get(field.name)
+            if target is not None and field.type != target and table.column(i).null_count == len(table):
+                table = table.set_column(i, field.name, pa.nulls(len(table), target))
+        aligned.append(table)
+
+    df = pa.concat_tables(aligned, promote_options='permissive').to_pandas()
+    # Sorted categories, as casting the concatenated values would give
+    sorted_categories = {
+        col: df[col].cat.reorder_categories(dtype.categories.sort_values())
+        for col, dtype in df.dtypes.items() if isinstance(dtype, pd.CategoricalDtype)
+    }
+    return df.assign(**sorted_categories)
+
+def memory_usage_bytes(df: pd.DataFrame) -> int:
+    """In-memory size of a table, including the contents of text columns"""
+    return int(df.memory_usage(deep=True).sum())
@@ -0,0 +1,134 @@
+import os
+import shutil
+import pandas as pd
+import pyarrow.dataset as ds
+from typing import Iterator, List, Optional
+from data_processing.schema import CATEGORICAL_COLUMNS, TABLE_SCHEMAS, apply_schema
+
+# Default on-disk format for integrated data and statistics
+STORAGE_FORMAT = "parquet"
+
+TABLE_EXTENSIONS = {
+    'parquet': '.parquet',
+    'csv': '.csv'
+}
+
+# Rows sampled when estimating the in-memory size of a table
+SAMPLE_ROWS = 1000
+
+def table_path(base_dir: str, name: str, fmt: str = STORAGE_FORMAT) -> str:
+    """Path of a stored table, e.g. stats/team-stats-overall.parquet"""
+    return os.path.join(base_dir, name + TABLE_EXTENSIONS[fmt])
+
+def apply_storage_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Give a table explicit, compact dtypes before it is written"""
+    df = df.copy()
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    if 'week' in df.columns:
+        df['week'] = pd.to_numeric(df['week'], errors='coerce').astype('Int16')
+    return df
+
+def _typed_csv(df: pd.DataFrame, name: str) -> pd.DataFrame:
+    """Dtypes for a table read from CSV: the declared schema for integrated tables"""
+    return apply_schema(df, name) if name in TABLE_SCHEMAS else apply_storage_dtypes(df)
+
+def write_table(df: pd.DataFrame, base_dir: str, name: str, fmt: str = STORAGE_FORMAT,
+                partition_cols: Optional[List[str]] = None, export_csv: bool = False) -> str:
+    """Write a table in the given format, optionally exporting a CSV copy alongside
+
+    Parquet tables can be partitioned (e.g. by week), in which case the
+    table is a directory of files. The write goes to a temporary path and is
+    swapped in, so readers never see a half-written table.
+    """
+    os.makedirs(base_dir, exist_ok=True)
+
+    # CSV copies are for people; reads prefer the configured format
+    if export_csv and fmt != 'csv':
+        write_table(df, base_dir, name, 'csv')
+
+    path = table_path(base_dir, name, fmt)
+    tmp_path = path + ".tmp"
+
+    if fmt == 'parquet':
+        if os.path.isdir(tmp_path):
+            shutil.rmtree(tmp_path)
+        apply_storage_dtypes(df).to_parquet(tmp_path, index=False, partition_cols=partition_cols)
+    elif fmt == 'csv':
+        df.to_csv(tmp_path, index=False)
+    else:
+        raise ValueError(f"Unknown storage format: {fmt}")
+
+    # Replace the previous table, which may be a file or a partitioned directory
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+    return path
+
+def _stored_table_path(base_dir: str, name: str) -> Optional[str]:
+    """Copy of a table in the configured format, else in another format if that is all there is"""
+    formats = [STORAGE_FORMAT] + [fmt for fmt in TABLE_EXTENSIONS if fmt != STORAGE_FORMAT]
+    for fmt in formats:
+        path = table_path(base_dir, name, fmt)
+        if os.path.exists(path):
+            return path
+    return None
+
+def table_exists(base_dir: str, name: str) -> bool:
+    """Check whether a table has been stored in any format"""
+    return _stored_table_path(base_dir, name) is not None
+
+def table_modified_time(base_dir: str, name: str) -> Optional[float]:
+    """When a table was last written, or None if it doesn't exist"""
+    path = _stored_table_path(base_dir, name)
+    return os.path.getmtime(path) if path else None
+
+def read_table(base_dir: str, name: str, columns: Optional[List[str]] = None,
+               filters: Optional[list] = None) -> Optional[pd.DataFrame]:
+    """Read a stored table, or None if it doesn't exist
+
+    The copy in STORAGE_FORMAT is read, so an exported CSV copy never
+    shadows it; the other format is only used when that copy is missing.
+    `filters` only applies to Parquet and can prune week partitions, e.g.
+    [('week', '>=', 5)].
+    """
+    path = _stored_table_path(base_dir, name)
+    if path is None:
+        return None
+
+    if path.endswith(TABLE_EXTENSIONS['parquet']):
+        return _normalize_week(pd.read_parquet(path, columns=columns, filters=filters))
+
+    return _typed_csv(pd.read_csv(path, usecols=columns), name)
+
+def _normalize_week(df: pd.DataFrame) -> pd.DataFrame:
+    """Partition columns come back as categoricals or int32; store weeks as Int16"""
+    if 'week' in df.columns and df['week'].dtype != 'Int16':
+        df['week'] = pd.to_numeric(df['week'].astype(str), errors='coerce').astype('Int16')
+    return df
+
+def iter_table_chunks(base_dir: str, name: str, chunk_rows: int,
+                      columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Read a stored table in chunks of at most `chunk_rows` rows"""
+    path = _stored_table_path(base_dir, name)
+    if path is None:
+        return
+
+    if path.endswith(TABLE_EXTENSIONS['parquet']):
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        for batch in dataset.to_batches(columns=columns, batch_size=chunk_rows):
+            if batch.num_rows:
+                yield _normalize_week(batch.to_pandas())
+        return
+
+    for chunk in pd.read_csv(path, usecols=columns, chunksize=chunk_rows):
+        yield _typed_csv(chunk, name)
+
+def estimate_row_bytes(base_dir: str, name: str) -> float:
+    """Approximate in-memory bytes per row of a stored table, from a sample"""
+    sample = next(iter_table_chunks(base_dir, name, SAMPLE_ROWS), None)
+    if sample is None or sample.empty:
+        return 1.0
+    return sample.memory_usage(deep=True).sum() / len(sample)
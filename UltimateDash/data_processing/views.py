@@ -0,0 +1,196 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+from data_processing.storage import read_table
+from data_processing.advanced_metrics import add_team_metrics, add_player_metrics
+from data_processing.ratings import rank_standings
+
+# Ready-to-render tables, built once per pipeline run so pages only look things up
+VIEWS_DIR = os.path.join("stats", "views")
+VIEW_NAMES = ['teams', 'players', 'games', 'standings', 'team_game_log', 'player_game_log', 'recent_games',
+              'leaderboards', 'pass_network']
+
+RECENT_GAMES = 5
+LEADERBOARD_SIZE = 10
+LEADERBOARD_STATS = ['points', 'assists', 'completions', 'throws', 'catches', 'blocks']
+LEADERBOARD_COLUMNS = ['name', 'team', 'points', 'assists', 'completions', 'throws', 'catches', 'blocks']
+
+# Per-team game stats carried on each games row as team1_<stat> and team2_<stat>
+GAME_SIDE_STATS = ['breaks', 'turnovers', 'completion_pct', 'yards']
+
+def build_teams_view(team_stats_overall: pd.DataFrame, team_stats_game: pd.DataFrame) -> pd.DataFrame:
+    """Shape overall and per-game team statistics into the dashboard's teams table"""
+    results = team_stats_game.assign(
+        points_for=team_stats_game['goals'],
+        points_against=team_stats_game['total_points'] - team_stats_game['goals']
+    )
+    results['wins'] = (results['points_for'] > results['points_against']).astype(int)
+    results['losses'] = (results['points_for'] < results['points_against']).astype(int)
+    record = results.groupby('team', observed=True)[['wins', 'losses', 'points_for', 'points_against']].sum().reset_index()
+
+    teams_df = add_team_metrics(team_stats_overall.merge(record, on='team', how='left'))
+    return teams_df.rename(columns={'team': 'name'})
+
+def build_players_view(player_stats_overall: pd.DataFrame) -> pd.DataFrame:
+    """Shape overall player statistics into the dashboard's players table"""
+    players_df = player_stats_overall.rename(columns={
+        'Player': 'name',
+        'Assists': 'assists',
+        'Defensive blocks': 'blocks',
+        'Turnovers': 'turnovers',
+        'Throws': 'throws',
+        'Catches': 'catches'
+    })
+    players_df['points'] = players_df['Goals'] + players_df['assists']
+    players_df['completions'] = (players_df['throws'] - players_df['turnovers']).clip(lower=0)
+    return add_player_metrics(players_df)
+
+def build_games_view(team_stats_game: pd.DataFrame) -> pd.DataFrame:
+    """One row per match with both teams' scores and game stats
+
+    Each tracked team contributes its own score and, through points played,
+    its opponent's; a team's own record wins when both sides were tracked.
+    Game stats are only known for tracked teams and are missing otherwise.
+    """
+    teams = team_stats_game['match'].astype(str).str.split(' @ ', n=1, expand=True)
+    games = team_stats_game.assign(team1=teams[0], team2=teams[1])
+    games['opponent'] = games['team2'].where(games['team'] == games['team1'], games['team1'])
+
+    own = games[['match', 'week', 'team', 'goals']].rename(columns={'goals': 'score'}).assign(priority=0)
+    against = games[['match', 'week', 'opponent']].rename(columns={'opponent': 'team'})
+    against = against.assign(score=games['total_points'] - games['goals'], priority=1)
+    scores = (pd.concat([own, against], ignore_index=True)
+        .sort_values('priority')
+        .drop_duplicates(['match', 'week', 'team'])
+        .astype({'team': str, 'match': str}))
+
+    side_stats = pd.DataFrame({
+        'match': games['match'].astype(str),
+        'week': games['week'],
+        'team': games['team'].astype(str),
+        'breaks': games['breaks'],
+        'turnovers': games['turnovers'],
+        'completion_pct': 1 - games['failed_passes'] / games['pass_attempts'].where(games['pass_attempts'] > 0),
+        'yards': games['completed_yards']
+    })
+    side_scores = scores[['match', 'week', 'team', 'score']].merge(side_stats, on=['match', 'week', 'team'], how='left')
+
+    games_df = games[['match', 'week', 'team1', 'team2']].drop_duplicates(['match', 'week']).astype({'match': str})
+    for side in ['team1', 'team2']:
+        games_df = games_df.merge(
+            side_scores.rename(columns={'team': side, 'score': f'{side}_score',
+                                        **{stat: f'{side}_{stat}' for stat in GAME_SIDE_STATS}}),
+            on=['match', 'week', side], how='left'
+        )
+
+    # Game files carry no date, so the week orders the season
+    games_df['date'] = games_df['week']
+    return games_df
+
+def build_standings_view(teams_df: pd.DataFrame, games_df: pd.DataFrame,
+                         ratings: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """League table ordered by win percentage, with tiebreakers, power ratings and strength of schedule
+
+    Ratings are computed from every game unless stored ones are passed in.
+    """
+    games_played = teams_df['wins'] + teams_df['losses']
+    standings = pd.DataFrame({
+        'team': teams_df['name'],
+        'wins': teams_df['wins'],
+        'losses': teams_df['losses'],
+        'win_percentage': (teams_df['wins'] / games_played.where(games_played > 0)).fillna(0),
+        'points_for': teams_df['points_for'],
+        'points_against': teams_df['points_against'],
+        'point_differential': teams_df['points_for'] - teams_df['points_against']
+    })
+    return rank_standings(standings, games_df, ratings)
+
+def build_team_game_log_view(games_df: pd.DataFrame) -> pd.DataFrame:
+    """Every game from each team's point of view, with own and opponent score
+
+    In "Away @ Home" matches the second team is at home.
+    """
+    sides = []
+    for own, other in [('team1', 'team2'), ('team2', 'team1')]:
+        sides.append(pd.DataFrame({
+            'team': games_df[own],
+            'opponent': games_df[other],
+            'match': games_df['match'],
+            'week': games_df['week'],
+            'date': games_df['date'],
+            'home': own == 'team2',
+            'score': games_df[f'{own}_score'],
+            'opponent_score': games_df[f'{other}_score']
+        }))
+    game_log = pd.concat(sides, ignore_index=True)
+    return game_log.sort_values(['team', 'date'], kind='stable').reset_index(drop=True)
+
+def build_player_game_log_view(player_stats_game: pd.DataFrame) -> pd.DataFrame:
+    """Every player's games in week order, with the same stat names as the players table"""
+    # Split each distinct match name once, not every row
+    matches = player_stats_game['match'].astype('category')
+    home_teams = matches.cat.categories.astype(str).str.split(' @ ', n=1).str[1]
+    home_team = np.asarray(home_teams)[matches.cat.codes]
+    game_log = pd.DataFrame({
+        'name': player_stats_game['Player'],
+        'team': player_stats_game['team'],
+        'match': player_stats_game['match'],
+        'week': player_stats_game['week'],
+        'home': player_stats_game['team'].astype(str).to_numpy() == home_team,
+        'points': player_stats_game['Goals'] + player_stats_game['Assists'],
+        'assists': player_stats_game['Assists'],
+        'blocks': player_stats_game['Defensive blocks'],
+        'turnovers': player_stats_game['Turnovers'],
+        'throws': player_stats_game['Throws'],
+        'catches': player_stats_game['Catches'],
+        'completions': (player_stats_game['Throws'] - player_stats_game['Turnovers']).clip(lower=0)
+    })
+    return game_log.sort_values(['team', 'name', 'week'], kind='stable').reset_index(drop=True)
+
+def build_recent_games_view(games_df: pd.DataFrame, n: int = RECENT_GAMES) -> pd.DataFrame:
+    """Most recent games first"""
+    return games_df.sort_values('date', ascending=False, kind='stable').head(n).reset_index(drop=True)
+
+def build_leaderboards_view(players_df: pd.DataFrame, n: int = LEADERBOARD_SIZE) -> pd.DataFrame:
+    """Top players for each leaderboard stat, in one long table keyed by stat and rank"""
+    boards = []
+    for stat in LEADERBOARD_STATS:
+        if stat not in players_df.columns:
+            continue
+        board = players_df.nlargest(n, stat)[LEADERBOARD_COLUMNS].reset_index(drop=True)
+        board.insert(0, 'rank', range(1, len(board) + 1))
+        board.insert(0, 'stat', stat)
+        boards.append(board)
+    return pd.concat(boards, ignore_index=True)
+
+def build_pass_network_view(pass_network: pd.DataFrame) -> pd.DataFrame:
+    """Per-game passing edges grouped by team, for building each team's network"""
+    return pass_network.sort_values(['team', 'week', 'match'], kind='stable').reset_index(drop=True)
+
+def build_views(team_stats_overall: pd.DataFrame, team_stats_game: pd.DataFrame, player_stats_overall: pd.DataFrame,
+                player_stats_game: pd.DataFrame, pass_network: pd.DataFrame,
+                ratings: Optional[pd.DataFrame] = None) -> Dict[str, pd.DataFrame]:
+    """Build every dashboard view from the statistics tables, and the stored power ratings if given"""
+    teams_df = build_teams_view(team_stats_overall, team_stats_game)
+    players_df = build_players_view(player_stats_overall)
+    games_df = build_games_view(team_stats_game)
+
+    return {
+        'teams': teams_df,
+        'players': players_df,
+        'games': games_df,
+        'standings': build_standings_view(teams_df, games_df, ratings),
+        'team_game_log': build_team_game_log_view(games_df),
+        'player_game_log': build_player_game_log_view(player_stats_game),
+        'recent_games': build_recent_games_view(games_df),
+        'leaderboards': build_leaderboards_view(players_df),
+        'pass_network': build_pass_network_view(pass_network)
+    }
+
+def load_views(views_dir: str = VIEWS_DIR) -> Optional[Dict[str, pd.DataFrame]]:
+    """Read all materialized views, or None if any is missing"""
+    views = {name: read_table(views_dir, name) for name in VIEW_NAMES}
+    if any(view is None for view in views.values()):
+        return None
+    return views
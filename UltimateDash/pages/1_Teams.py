@@ -1,18 +1,22 @@
 import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
 import pandas as pd
+from data_store import get_shared_data, show_data_freshness
+from charts import MAX_TREND_POINTS, score_trend_figure, role_matrix_figure
+from utils import select_form_window
 
 st.title("Team Statistics")
 
+data = get_shared_data()
+show_data_freshness(data)
+
 # Team selector
 selected_team = st.selectbox(
     "Select Team",
-    options=st.session_state.teams_df['name'].tolist()
+    options=data.index.team_names
 )
 
 # Display team stats
-team_data = st.session_state.teams_df[st.session_state.teams_df['name'] == selected_team].iloc[0]
+team_data = data.index.team(selected_team)
 
 # Basic stats
 col1, col2, col3, col4 = st.columns(4)
@@ -31,17 +35,31 @@ with col4:
 st.subheader("Advanced Statistics")
 col1, col2, col3 = st.columns(3)
 
+# Rates are computed by the pipeline, so teams without opportunities show 0%
 with col1:
-    break_pct = round(team_data['break_conversions'] / team_data['break_opportunities'] * 100, 1)
-    st.metric("Break Conversion %", f"{break_pct}%")
+    st.metric("Break Conversion %", f"{round(team_data['break_conversion_rate'] * 100, 1)}%")
 
 with col2:
-    red_zone_pct = round(team_data['red_zone_scores'] / team_data['red_zone_attempts'] * 100, 1)
-    st.metric("Red Zone Efficiency", f"{red_zone_pct}%")
+    st.metric("Red Zone Efficiency", f"{round(team_data['red_zone_efficiency'] * 100, 1)}%")
 
 with col3:
     st.metric("Completion %", f"{round(team_data['completion_percentage'] * 100, 1)}%")
 
+# Form over a window of recent games, a venue or a range of weeks
+st.subheader("Form")
+window = select_form_window(data.index.weeks, key="team_form")
+form = data.team_form.window(**window).iloc[data.index.team_position(selected_team)]
+
+col1, col2, col3, col4 = st.columns(4)
+with col1:
+    st.metric("Games", form['games'])
+with col2:
+    st.metric("Record", f"{form['wins']}-{form['losses']}")
+with col3:
+    st.metric("Points For", form['points_for'])
+with col4:
+    st.metric("Point Differential", form['points_for'] - form['points_against'])
+
 # Team roster with advanced stats
 st.subheader("Team Roster")
 
@@ -52,7 +70,7 @@ stat_type = st.radio(
     horizontal=True
 )
 
-team_players = st.session_state.players_df[st.session_state.players_df['team'] == selected_team]
+team_players = data.index.roster(selected_team)
 
 if stat_type == "Basic Stats":
     display_cols = ['name', 'points', 'assists', 'blocks', 'turnovers']
@@ -69,54 +87,48 @@ st.dataframe(
 # Team performance visualizations
 st.subheader("Performance Analysis")
 
-# Game flow chart
-team_games = st.session_state.games_df[
-    (st.session_state.games_df['team1'] == selected_team) |
-    (st.session_state.games_df['team2'] == selected_team)
-].copy()
+# Game flow chart, from the team's precomputed game log
+team_games = data.index.team_games(selected_team)
 
-# Process game data for visualization
-team_games['score'] = team_games.apply(
-    lambda x: x['team1_score'] if x['team1'] == selected_team else x['team2_score'],
-    axis=1
-)
-team_games['opponent_score'] = team_games.apply(
-    lambda x: x['team2_score'] if x['team1'] == selected_team else x['team1_score'],
-    axis=1
-)
+# Long histories are averaged down unless the user asks for every game
+max_points = MAX_TREND_POINTS
+if len(team_games) > MAX_TREND_POINTS and st.checkbox("Show every game"):
+    max_points = None
 
-# Create score trend chart
-fig = go.Figure()
-fig.add_trace(go.Scatter(
-    x=team_games['date'],
-    y=team_games['score'],
-    name='Team Score',
-    line=dict(color='blue')
-))
-fig.add_trace(go.Scatter(
-    x=team_games['date'],
-    y=team_games['opponent_score'],
-    name='Opponent Score',
-    line=dict(color='red')
-))
-fig.update_layout(
-    title=f"{selected_team} Score Trends",
-    xaxis_title="Date",
-    yaxis_title="Score"
-)
+# Figures are cached per data version and team
+fig = score_trend_figure(data.version, selected_team, team_games, max_points)
 st.plotly_chart(fig, use_container_width=True)
 
 # Player role distribution
 st.subheader("Player Roles Distribution")
-role_fig = px.scatter(
-    team_players,
-    x='handler_cutter_score',
-    y='offense_defense_score',
-    hover_data=['name'],
-    labels={
-        'handler_cutter_score': 'Handler (0) to Cutter (100)',
-        'offense_defense_score': 'Offense (0) to Defense (100)'
-    },
-    title="Player Role Matrix"
+role_fig = role_matrix_figure(data.version, selected_team, team_players)
+st.plotly_chart(role_fig, use_container_width=True)
+
+# Passing network, for the season or a single game
+st.subheader("Passing Network")
+game_position = st.selectbox(
+    "Games",
+    options=range(len(team_games)),
+    index=None,
+    format_func=lambda i: f"Week {team_games.iloc[i]['week']}: {team_games.iloc[i]['match']}",
+    placeholder="Whole season"
 )
-st.plotly_chart(role_fig, use_container_width=True)
\ No newline at end of file
+network_game = None
+if game_position is not None:
+    network_game = (team_games.iloc[game_position]['match'], team_games.iloc[game_position]['week'])
+
+col1, col2 = st.columns(2)
+with col1:
+    st.caption("Top connections")
+    st.dataframe(
+        data.pass_network.top_connections(selected_team, network_game),
+        hide_index=True,
+        use_container_width=True
+    )
+with col2:
+    st.caption("Centrality")
+    st.dataframe(
+        data.pass_network.centrality(selected_team, network_game).sort_values('pagerank', ascending=False),
+        hide_index=True,
+        use_container_width=True
+    )
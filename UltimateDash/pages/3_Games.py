@@ -1,10 +1,22 @@
 import streamlit as st
+import math
 import pandas as pd
+from data_store import get_shared_data, show_data_freshness
+
+# Summary rows rendered per page; details are built for one game at a time
+GAMES_PER_PAGE = 20
+
+def format_stat(value, template: str = "{}") -> str:
+    """Format a game stat, showing a dash for teams whose stats weren't tracked"""
+    return "-" if pd.isna(value) else template.format(value)
 
 st.title("Game Results")
 
+data = get_shared_data()
+show_data_freshness(data)
+
 # Week filter
-week_numbers = sorted(st.session_state.games_df['week'].unique())
+week_numbers = data.index.weeks
 selected_week = st.selectbox(
     "Select Week",
     options=week_numbers,
@@ -12,37 +24,46 @@ selected_week = st.selectbox(
 )
 
 # Filter games by selected week
-filtered_games = st.session_state.games_df[st.session_state.games_df['week'] == selected_week]
+filtered_games = data.index.week_games(selected_week)
 
-# Display games for the selected week
+# Display games for the selected week, one page at a time
 st.subheader(f"Week {selected_week} Games")
 
-for _, game in filtered_games.iterrows():
-    col1, col2, col3 = st.columns([2, 1, 2])
-    with col1:
-        st.write(game['team1'])
-    with col2:
-        st.write(f"{game['team1_score']} - {game['team2_score']}")
-    with col3:
-        st.write(game['team2'])
-
-    # Add game details in an expander
-    with st.expander("Game Details"):
-        # Create two columns for team stats
-        team1_col, team2_col = st.columns(2)
-
-        with team1_col:
-            st.subheader(game['team1'])
-            st.write(f"Breaks: {game['team1_breaks']}")
-            st.write(f"Turnovers: {game['team1_turnovers']}")
-            st.write(f"Completion %: {game['team1_completion_pct']*100:.1f}%")
-            st.write(f"Total Yards: {game['team1_yards']}")
-
-        with team2_col:
-            st.subheader(game['team2'])
-            st.write(f"Breaks: {game['team2_breaks']}")
-            st.write(f"Turnovers: {game['team2_turnovers']}")
-            st.write(f"Completion %: {game['team2_completion_pct']*100:.1f}%")
-            st.write(f"Total Yards: {game['team2_yards']}")
-
-    st.divider()
\ No newline at end of file
+page_count = max(1, math.ceil(len(filtered_games) / GAMES_PER_PAGE))
+page = 1
+if page_count > 1:
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                           key=f"games_page_{selected_week}")
+page_games = filtered_games.iloc[(page - 1) * GAMES_PER_PAGE:page * GAMES_PER_PAGE]
+
+st.dataframe(
+    page_games[['team1', 'team1_score', 'team2_score', 'team2']].rename(columns={
+        'team1': 'Team 1', 'team1_score': 'Score 1', 'team2_score': 'Score 2', 'team2': 'Team 2'
+    }),
+    hide_index=True,
+    use_container_width=True
+)
+
+# Game details, built only for the game the user opens
+selected_game = st.selectbox(
+    "Game Details",
+    options=range(len(page_games)),
+    index=None,
+    format_func=lambda i: f"{page_games.iloc[i]['team1']} vs {page_games.iloc[i]['team2']}",
+    placeholder="Select a game",
+    key=f"games_detail_{selected_week}_{page}"
+)
+
+if selected_game is not None:
+    game = page_games.iloc[selected_game]
+
+    # Create two columns for team stats
+    team1_col, team2_col = st.columns(2)
+
+    for side, col in [('team1', team1_col), ('team2', team2_col)]:
+        with col:
+            st.subheader(game[side])
+            st.write(f"Breaks: {format_stat(game[f'{side}_breaks'], '{:.0f}')}")
+            st.write(f"Turnovers: {format_stat(game[f'{side}_turnovers'], '{:.0f}')}")
+            st.write(f"Completion %: {format_stat(game[f'{side}_completion_pct'] * 100, '{:.1f}%')}")
+            st.write(f"Total Yards: {format_stat(game[f'{side}_yards'], '{:.0f}')}")
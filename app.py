@@ -1,7 +1,10 @@
+import time
 import streamlit as st
 import pandas as pd
-from data_loader import process_and_load_data
+from datetime import datetime
+from data_store import get_shared_data, request_data_refresh, show_data_freshness
 from utils import load_css
+from data_processing.instrumentation import load_pipeline_runs, summarize_run
 
 # Page config
 st.set_page_config(
@@ -17,14 +20,13 @@ load_css()
 with st.sidebar:
     st.title("Data Controls")
     if st.button("🔄 Refresh Data"):
-        st.session_state.data_loaded = False
-        st.rerun()
+        # Runs in the background; concurrent clicks share one refresh
+        request_data_refresh()
+        st.toast("Refresh started. New data appears once it finishes.")
 
-# Initialize session state for data
-if 'data_loaded' not in st.session_state:
-    with st.spinner("Loading latest statistics..."):
-        st.session_state.teams_df, st.session_state.players_df, st.session_state.games_df = process_and_load_data()
-        st.session_state.data_loaded = True
+# All sessions share one copy of the data, refreshed in the background
+data = get_shared_data()
+show_data_freshness(data)
 
 # Main page
 st.title("🥏 Ultimate Frisbee League Statistics")
@@ -33,17 +35,17 @@ st.title("🥏 Ultimate Frisbee League Statistics")
 col1, col2, col3 = st.columns(3)
 
 with col1:
-    st.metric("Total Teams", len(st.session_state.teams_df))
+    st.metric("Total Teams", len(data.teams_df))
 
 with col2:
-    st.metric("Total Players", len(st.session_state.players_df))
+    st.metric("Total Players", len(data.players_df))
 
 with col3:
-    st.metric("Games Played", len(st.session_state.games_df))
+    st.metric("Games Played", len(data.games_df))
 
 # Recent games
 st.subheader("Recent Games")
-recent_games = st.session_state.games_df.sort_values('date', ascending=False).head(5)
+recent_games = data.views['recent_games']
 st.dataframe(
     recent_games[['date', 'team1', 'team1_score', 'team2', 'team2_score']],
     use_container_width=True
@@ -51,7 +53,8 @@ st.dataframe(
 
 # Top performers
 st.subheader("Top Performers")
-top_players = st.session_state.players_df.nlargest(5, 'points')
+leaderboards = data.views['leaderboards']
+top_players = leaderboards[leaderboards['stat'] == 'points'].head(5)
 st.dataframe(
     top_players[['name', 'team', 'points', 'assists', 'completions']],
     use_container_width=True
@@ -60,6 +63,48 @@ st.dataframe(
 # Add data source information
 st.sidebar.markdown("---")
 st.sidebar.info("""
-Data is processed from game statistics files stored in Google Drive.
-Click the refresh button to load the latest data.
+Data is processed from game statistics files stored in Dropbox and
+refreshed in the background. Click the refresh button to fetch the
+latest data now.
 """)
+
+# Pipeline health, from the metrics each pipeline run emits
+with st.sidebar.expander("Pipeline health"):
+    runs = [summarize_run(run) for run in load_pipeline_runs()]
+    if not runs:
+        st.caption("No pipeline runs recorded yet.")
+    else:
+        latest = runs[0]
+        started = datetime.fromtimestamp(latest['started_at']).strftime("%Y-%m-%d %H:%M")
+        st.caption(f"Last run: {started} ({latest['status']})")
+
+        finished = [run for run in runs if run['status'] == 'ok']
+        if finished:
+            age_minutes = (time.time() - finished[0]['finished_at']) / 60
+            st.caption(f"Last successful run finished {age_minutes:.0f} min ago")
+            median_time = pd.Series([run['wall_time_s'] for run in finished]).median()
+            st.caption(f"Median run time over last {len(finished)} successful runs: {median_time:.1f}s")
+
+        if latest['stage_times_s']:
+            stage_table = pd.DataFrame({
+                'seconds': pd.Series(latest['stage_times_s']),
+                # Memory each stage kept, rather than the process's lifetime peak
+                'memory change (MB)': pd.Series(latest['stage_rss_delta_bytes'], dtype='float64') / 1024 / 1024
+            }).round({'memory change (MB)': 1})
+            st.dataframe(
+                stage_table.rename_axis('stage').reset_index(),
+                hide_index=True,
+                use_container_width=True
+            )
+        if latest['bytes_downloaded'] is not None:
+            st.caption(f"Downloaded: {latest['bytes_downloaded'] / 1024 / 1024:.1f} MB")
+        if latest['cache_hits'] is not None:
+            st.caption(f"Game cache: {latest['cache_hits']} hits, {latest['cache_misses']} misses")
+        if latest['schema_problems']:
+            st.warning(f"{latest['schema_problems']} schema problems in game files")
+            for problem in latest['schema_problem_examples']:
+                st.caption(problem)
+        st.caption(f"Process peak memory: {latest['process_peak_rss_bytes'] / 1024 / 1024:.0f} MB")
+        st.caption(f"Worker process peak memory: {latest['process_peak_child_rss_bytes'] / 1024 / 1024:.0f} MB")
+        if latest['error']:
+            st.error(f"Last run failed: {latest['error']}")
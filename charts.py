@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+from typing import List, Optional
+from data_processing.ratings import INITIAL_RATING
+
+# Figures kept per server process, keyed by (data version, team, chart type)
+FIGURE_CACHE_SIZE = 256
+
+# Longer score histories are averaged into this many points before plotting
+MAX_TREND_POINTS = 200
+
+# Scatter plots with at least this many points are drawn with WebGL
+WEBGL_MIN_POINTS = 500
+
+def downsample_series(df: pd.DataFrame, x: str, y: List[str], max_points: Optional[int] = MAX_TREND_POINTS) -> pd.DataFrame:
+    """Average consecutive rows into at most `max_points` buckets
+
+    Each bucket is placed at its last x value, so the trend still ends at
+    the most recent game. Short series, or `max_points=None`, pass through.
+    """
+    if max_points is None or len(df) <= max_points:
+        return df[[x] + y]
+
+    bucket = np.arange(len(df)) * max_points // len(df)
+    return df.groupby(bucket).agg(**{x: (x, 'last')}, **{col: (col, 'mean') for col in y}).round(1)
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def score_trend_figure(version: int, team: str, _team_games: pd.DataFrame,
+                       max_points: Optional[int] = MAX_TREND_POINTS) -> go.Figure:
+    """A team's score and opponent score over its games"""
+    trend = downsample_series(_team_games, 'date', ['score', 'opponent_score'], max_points)
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=trend['date'],
+        y=trend['score'],
+        name='Team Score',
+        line=dict(color='blue')
+    ))
+    fig.add_trace(go.Scatter(
+        x=trend['date'],
+        y=trend['opponent_score'],
+        name='Opponent Score',
+        line=dict(color='red')
+    ))
+    fig.update_layout(
+        title=f"{team} Score Trends",
+        xaxis_title="Date",
+        yaxis_title="Score"
+    )
+    return fig
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def role_matrix_figure(version: int, team: str, _team_players: pd.DataFrame) -> go.Figure:
+    """Handler/cutter against offense/defense scores for a team's players"""
+    return px.scatter(
+        _team_players,
+        x='handler_cutter_score',
+        y='offense_defense_score',
+        hover_data=['name'],
+        labels={
+            'handler_cutter_score': 'Handler (0) to Cutter (100)',
+            'offense_defense_score': 'Offense (0) to Defense (100)'
+        },
+        title="Player Role Matrix",
+        render_mode='webgl' if len(_team_players) >= WEBGL_MIN_POINTS else 'svg'
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def record_figure(version: int, _standings: pd.DataFrame) -> go.Figure:
+    """Wins and losses per team"""
+    return px.bar(
+        _standings,
+        x='team',
+        y=['wins', 'losses'],
+        title="Team Records",
+        barmode='group'
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def point_differential_figure(version: int, _standings: pd.DataFrame) -> go.Figure:
+    """Point differential per team"""
+    return px.bar(
+        _standings,
+        x='team',
+        y='point_differential',
+        title="Team Point Differential",
+        color='point_differential'
+    )
+
+@st.cache_resource(max_entries=FIGURE_CACHE_SIZE)
+def rating_figure(version: int, _standings: pd.DataFrame) -> go.Figure:
+    """Power rating per team, against the starting rating"""
+    fig = px.bar(
+        _standings.sort_values('rating', ascending=False),
+        x='team',
+        y='rating',
+        title="Team Power Ratings",
+        color='strength_of_schedule',
+        labels={'strength_of_schedule': 'Strength of Schedule'}
+    )
+    fig.add_hline(y=INITIAL_RATING, line_dash='dash')
+    return fig
@@ -0,0 +1,252 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Tuple
+from data_processing.calculate_statistics import (
+    calculate_all_statistics, calculate_pass_edge_partials, calculate_pass_network, PLAYER_SUM_COLUMNS,
+    PLAYER_YARDAGE_COLUMNS
+)
+from data_processing.views import build_views
+from data_processing.schema import apply_schema, FIELD_LENGTH_YD, ENDZONE_DEPTH_YD, START_Y_COLUMN, END_Y_COLUMN
+
+# Scale of the default sample season
+DEFAULT_TEAMS = 8
+DEFAULT_WEEKS = 6
+DEFAULT_POINTS_PER_GAME = 25
+DEFAULT_PASSES_PER_POINT = 8
+DEFAULT_PLAYERS_PER_TEAM = 14
+
+# Depth of an end zone in field position units
+ENDZONE_DEPTH = ENDZONE_DEPTH_YD / FIELD_LENGTH_YD
+
+# Rates shaping the generated play
+PLAYERS_ON_FIELD = 7
+TURNOVER_RATE = 0.08
+THROWAWAY_SHARE = 0.7
+HUCK_RATE = 0.08
+BLOCK_RATE = 0.15
+PULL_RECEIVED_Y = 0.8
+
+# Tag columns the integration step adds to every game file row
+TAG_COLUMNS = ['week', 'match', 'team']
+
+# Names are single words, and none contains another, so file names identify their team
+TEAM_NAMES = [
+    'Aces', 'Bolts', 'Comets', 'Drifters', 'Embers', 'Falcons', 'Glaciers', 'Hurricanes',
+    'Ironclads', 'Jaguars', 'Kestrels', 'Lynx', 'Mavericks', 'Nomads', 'Outlaws', 'Ravens'
+]
+FIRST_NAMES = [
+    'Alex', 'Blair', 'Casey', 'Dana', 'Eli', 'Frankie', 'Gray', 'Harper', 'Indy', 'Jordan',
+    'Kai', 'Logan', 'Morgan', 'Noor', 'Oakley', 'Parker', 'Quinn', 'Riley', 'Sam', 'Taylor'
+]
+LAST_NAMES = [
+    'Abara', 'Brooks', 'Chen', 'Diaz', 'Eriksen', 'Fischer', 'Garcia', 'Haddad', 'Ito', 'Jensen',
+    'Kowalski', 'Lopez', 'Moreau', 'Nakamura', 'Okafor', 'Patel', 'Rossi', 'Silva', 'Tanaka', 'Novak'
+]
+
+def season_team_names(teams: int) -> List[str]:
+    """Names for a league of `teams` teams"""
+    if teams <= len(TEAM_NAMES):
+        return TEAM_NAMES[:teams]
+    return [f"Team{i:03d}" for i in range(1, teams + 1)]
+
+def roster_names(teams: int, players_per_team: int) -> np.ndarray:
+    """Unique player names, one row per team"""
+    names = []
+    for i in range(teams * players_per_team):
+        name = f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+        cycle = i // (len(FIRST_NAMES) * len(LAST_NAMES))
+        names.append(f"{name} {cycle + 1}" if cycle else name)
+    return np.array(names, dtype=object).reshape(teams, players_per_team)
+
+def season_schedule(teams: int, weeks: int) -> pd.DataFrame:
+    """Round-robin schedule: every team plays once a week, home and away alternating"""
+    slots = list(range(teams)) + ([-1] if teams % 2 else [])
+    games = []
+    for week in range(weeks):
+        # Circle method: the first slot stays put, the rest rotate each round
+        rotation = week % (len(slots) - 1)
+        others = slots[1:]
+        order = [slots[0]] + others[-rotation:] + others[:-rotation] if rotation else slots
+        for i in range(len(order) // 2):
+            home, away = order[i], order[-1 - i]
+            if home < 0 or away < 0:
+                continue
+            if week % 2:
+                home, away = away, home
+            games.append((week + 1, home, away))
+    return pd.DataFrame(games, columns=['week', 'team1', 'team2'])
+
+def _within_group(values: np.ndarray, starts: np.ndarray, group: np.ndarray) -> np.ndarray:
+    """Running total of `values` before each row, restarting at every group"""
+    before = np.cumsum(values) - values
+    return before - before[starts[group]]
+
+def generate_season(teams: int = DEFAULT_TEAMS, weeks: int = DEFAULT_WEEKS,
+                    points_per_game: int = DEFAULT_POINTS_PER_GAME,
+                    passes_per_point: int = DEFAULT_PASSES_PER_POINT,
+                    players_per_team: int = DEFAULT_PLAYERS_PER_TEAM, seed: int = 0) -> Dict[str, pd.DataFrame]:
+    """A synthetic season as integrated Points, Passes and Player-Stats tables
+
+    Rows use the game file columns plus the week, match and team tags, typed
+    by the integrated table schema, and the same seed always gives the same season. Both teams track every game.
+    Each point's scoring team ends its passes with an assist and the other
+    team's last pass is a turnover; player stats are tallied from the passes.
+    """
+    rng = np.random.default_rng(seed)
+    team_names = np.array(season_team_names(teams), dtype=object)
+    rosters = roster_names(teams, players_per_team)
+    schedule = season_schedule(teams, weeks)
+    team_ids = np.column_stack([schedule['team1'], schedule['team2']])
+    matches = (team_names[schedule['team1']] + " @ " + team_names[schedule['team2']]).astype(object)
+
+    # Step 1: Points, one row per team and point, grouped by team-game like the game files
+    n_points = len(schedule) * points_per_game
+    scorer = rng.integers(0, 2, n_points)
+    point_number = np.tile(np.arange(1, points_per_game + 1), len(schedule))
+    first_offense = rng.integers(0, 2, len(schedule))
+    # The team that conceded receives the next pull
+    offense = np.where(point_number == 1, np.repeat(first_offense, points_per_game), 1 - np.roll(scorer, 1))
+
+    team_game = np.repeat(np.arange(2 * len(schedule)), points_per_game)
+    game = team_game // 2
+    side = team_game % 2
+    point_index = np.arange(len(team_game)) % points_per_game
+    point_row = game * points_per_game + point_index
+    scored = scorer[point_row] == side
+    on_offense = offense[point_row] == side
+    team_id = team_ids[game, side]
+
+    # Step 2: Passes, each point's passes in order
+    n_passes = rng.poisson(passes_per_point, len(team_game))
+    n_passes = np.where(scored, np.maximum(n_passes, 1), n_passes)
+    starts = np.cumsum(n_passes) - n_passes
+    row = np.repeat(np.arange(len(team_game)), n_passes)
+    position = np.arange(len(row)) - starts[row]
+    is_last = position == n_passes[row] - 1
+
+    assist = is_last & scored[row]
+    turnover = np.where(is_last, ~scored[row], rng.random(len(row)) < TURNOVER_RATE)
+    huck = rng.random(len(row)) < HUCK_RATE
+    distance = np.where(huck, rng.normal(40, 8, len(row)), rng.normal(4, 7, len(row))).round(1)
+    possession = 1 + _within_group(turnover.astype(int), starts, row)
+
+    # The disc moves between distinct teammates: each pass hops a random number of roster slots
+    hops = rng.integers(1, players_per_team, len(row))
+    holder = (rng.integers(0, players_per_team, len(team_game))[row] + _within_group(hops, starts, row)) % players_per_team
+    catcher = (holder + hops) % players_per_team
+    throwaway = turnover & (rng.random(len(row)) < THROWAWAY_SHARE)
+
+    start_y = np.clip(PULL_RECEIVED_Y - _within_group(distance, starts, row) / FIELD_LENGTH_YD, ENDZONE_DEPTH, 1)
+    end_y = np.clip(start_y - distance / FIELD_LENGTH_YD, ENDZONE_DEPTH, 1)
+    end_y = np.where(assist, rng.uniform(0, ENDZONE_DEPTH, len(row)), end_y)
+
+    pass_team = team_id[row]
+    passes_df = pd.DataFrame({
+        'Point': point_index[row] + 1,
+        'Possession': possession,
+        'Thrower': rosters[pass_team, holder],
+        'Receiver': np.where(throwaway, None, rosters[pass_team, catcher]),
+        'Turnover?': turnover.astype(int),
+        'Assist?': assist.astype(int),
+        'Huck?': huck.astype(int),
+        'Forward distance (yd)': distance,
+        START_Y_COLUMN: start_y.round(3),
+        END_Y_COLUMN: end_y.round(3),
+        'week': schedule['week'].to_numpy()[game[row]],
+        'match': matches[game[row]],
+        'team': team_names[pass_team]
+    })
+
+    turnovers = np.bincount(row, weights=turnover, minlength=len(team_game)).astype(int)
+    blocks = rng.binomial(2, BLOCK_RATE, len(team_game))
+    points_df = pd.DataFrame({
+        'Point': point_index + 1,
+        'Started on offense?': on_offense.astype(int),
+        'Scored?': scored.astype(int),
+        'Possessions': np.bincount(row, weights=is_last * possession, minlength=len(team_game)).astype(int),
+        'Passes': n_passes,
+        'Turnovers': turnovers,
+        'Defensive blocks': blocks,
+        'week': schedule['week'].to_numpy()[game],
+        'match': matches[game],
+        'team': team_names[team_id]
+    })
+
+    # Step 3: Player stats, tallied per team-game and roster slot from the passes
+    slots = 2 * len(schedule) * players_per_team
+    pass_team_game = team_game[row] * players_per_team
+    thrower_slot = pass_team_game + holder
+    catcher_slot = pass_team_game + catcher
+    completed = turnover == 0
+
+    def tally(slot: np.ndarray, weights) -> np.ndarray:
+        return np.bincount(slot, weights=weights, minlength=slots)
+
+    # A possession starts with a point's first pass or the first one after a turnover
+    first_of_possession = (position == 0) | (np.roll(turnover, 1) & (position > 0))
+    catches = tally(catcher_slot, completed)
+    possessions_initiated = tally(thrower_slot, first_of_possession)
+    block_slot = np.repeat(team_game, blocks) * players_per_team + rng.integers(0, players_per_team, blocks.sum())
+    offense_points = np.bincount(team_game, weights=on_offense, minlength=2 * len(schedule)).astype(int)
+    share = PLAYERS_ON_FIELD / players_per_team if players_per_team > PLAYERS_ON_FIELD else 1
+
+    slot_team_game = np.arange(slots) // players_per_team
+    slot_game = slot_team_game // 2
+    slot_team = team_ids[slot_game, slot_team_game % 2]
+    player_stats_df = pd.DataFrame({
+        'Player': rosters[slot_team, np.arange(slots) % players_per_team],
+        'Touches': catches + possessions_initiated,
+        'Throws': tally(thrower_slot, None),
+        'Catches': catches,
+        'Defensive blocks': np.bincount(block_slot, minlength=slots),
+        'Goals': tally(catcher_slot, assist),
+        'Turnovers': tally(thrower_slot, throwaway) + tally(catcher_slot, turnover & ~throwaway),
+        'Total completed throw gain (yd)': tally(thrower_slot, distance * completed).round(1),
+        'Total caught pass gain (yd)': tally(catcher_slot, distance * completed).round(1),
+        'Offense points played': rng.binomial(offense_points[slot_team_game], share),
+        'Defense points played': rng.binomial(points_per_game - offense_points[slot_team_game], share),
+        'Possessions initiated': possessions_initiated,
+        'Assists': tally(thrower_slot, assist),
+        'week': schedule['week'].to_numpy()[slot_game],
+        'match': matches[slot_game],
+        'team': team_names[slot_team]
+    })
+    count_columns = [c for c in PLAYER_SUM_COLUMNS if c not in PLAYER_YARDAGE_COLUMNS]
+    player_stats_df[count_columns] = player_stats_df[count_columns].astype(int)
+
+    season = {'Points': points_df, 'Passes': passes_df, 'Player-Stats': player_stats_df}
+    return {name: apply_schema(df, name) for name, df in season.items()}
+
+def write_game_files(season: Dict[str, pd.DataFrame], local_dir: str) -> List[str]:
+    """Write a season as raw game files, laid out like the Dropbox folder
+
+    Each team's file for a game goes to `Week_<n>/<Team1> @ <Team2>/<Team> <Kind>.csv`.
+    """
+    paths = []
+    for kind, df in season.items():
+        for (week, match, team), rows in df.groupby(TAG_COLUMNS, sort=False, observed=True):
+            game_dir = os.path.join(local_dir, f"Week_{week}", match)
+            os.makedirs(game_dir, exist_ok=True)
+            path = os.path.join(game_dir, f"{team} {kind}.csv")
+            # Game files record flags as 0/1
+            raw = rows.drop(columns=TAG_COLUMNS)
+            flags = raw.select_dtypes(bool).columns
+            raw[flags] = raw[flags].astype(int)
+            raw.to_csv(path, index=False)
+            paths.append(path)
+    return paths
+
+def generate_all_data(**scale) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """Sample teams, players and games tables plus the other dashboard views
+
+    Runs a synthetic season (see `generate_season` for the scale arguments)
+    through the same statistics and view code as real data.
+    """
+    season = generate_season(**scale)
+    team_stats_overall, team_stats_game, player_stats_overall, player_stats_game = calculate_all_statistics(
+        season['Points'], season['Passes'], season['Player-Stats']
+    )
+    pass_network = calculate_pass_network(calculate_pass_edge_partials(season['Passes']))
+    views = build_views(team_stats_overall, team_stats_game, player_stats_overall, player_stats_game, pass_network)
+    return views['teams'], views['players'], views['games'], views
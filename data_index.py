@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+class DataIndex:
+    """Lookups by team and week over one data snapshot
+
+    Built once per data version, so a page rerun finds a team's row, roster
+    or games with a dictionary lookup instead of scanning the tables.
+    """
+
+    def __init__(self, teams_df: pd.DataFrame, players_df: pd.DataFrame, games_df: pd.DataFrame,
+                 team_game_log: pd.DataFrame):
+        self._teams_df = teams_df
+        self._players_df = players_df
+        self._games_df = games_df
+        self._team_game_log = team_game_log
+
+        self.team_names: List[str] = teams_df['name'].astype(str).tolist()
+        self._team_rows: Dict[str, int] = {name: i for i, name in enumerate(self.team_names)}
+        self._rosters = _group_positions(players_df['team'])
+        self._team_games = _group_positions(team_game_log['team'])
+        self._week_games = _group_positions(games_df['week'])
+        self.weeks = sorted(int(week) for week in self._week_games)
+
+    def team(self, name: str) -> pd.Series:
+        """The teams table row for a team"""
+        return self._teams_df.iloc[self._team_rows[name]]
+
+    def team_position(self, name: str) -> int:
+        """Row position of a team in the teams table"""
+        return self._team_rows[name]
+
+    def roster(self, team: str) -> pd.DataFrame:
+        """Players of a team"""
+        return self._players_df.iloc[self._rosters.get(team, _NO_ROWS)]
+
+    def team_games(self, team: str) -> pd.DataFrame:
+        """A team's game log, with its own and its opponent's score"""
+        return self._team_game_log.iloc[self._team_games.get(team, _NO_ROWS)]
+
+    def week_games(self, week) -> pd.DataFrame:
+        """Games played in a week"""
+        return self._games_df.iloc[self._week_games.get(week, _NO_ROWS)]
+
+_NO_ROWS = np.array([], dtype=np.intp)
+
+def _group_positions(keys: pd.Series) -> Dict:
+    """Row positions for each distinct key"""
+    if isinstance(keys.dtype, pd.CategoricalDtype):
+        keys = keys.astype(str)
+    return keys.groupby(keys, sort=False).indices
+
+def build_data_index(teams_df: pd.DataFrame, players_df: pd.DataFrame, games_df: pd.DataFrame,
+                     views: Dict[str, pd.DataFrame]) -> DataIndex:
+    """Index a snapshot's tables"""
+    return DataIndex(teams_df, players_df, games_df, views['team_game_log'])
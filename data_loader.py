@@ -1,29 +1,26 @@
 import os
 import pandas as pd
 import streamlit as st
-from typing import Tuple
+from typing import Dict, Tuple
 from data_processing.main import process_dropbox_data
-from data_generator import generate_all_data
+from data_processing.views import load_views, VIEWS_DIR
 
-# Use Streamlit cache to avoid redownloading data frequently
-@st.cache_data(ttl=3600)  # Cache for 1 hour
-def process_and_load_data() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
-    """
-    Process game data from Dropbox and load the results
-    Falls back to sample data if processing fails
-    """
-    try:
-        # Process the Dropbox folder
-        process_dropbox_data("/2024_game_day_info")  # Adjust path based on your Dropbox structure
+# Dropbox folder holding the season's game files, and its local mirror
+DROPBOX_FOLDER = "/2024_game_day_info"  # Adjust path based on your Dropbox structure
+LOCAL_GAME_DIR = "game_day_info"
 
-        # Load the processed data
-        teams_df, players_df, games_df = load_stats_data()
-        if all(df is not None for df in [teams_df, players_df, games_df]):
-            return teams_df, players_df, games_df
+def load_stats_data(views_dir: str = VIEWS_DIR) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """Load the precomputed teams, players and games tables plus the other dashboard views"""
+    views = load_views(views_dir)
+    if views is None:
+        return None, None, None, None
+    return views['teams'], views['players'], views['games'], views
 
-        print("Using sample data as fallback...")
-        return generate_all_data()
+def run_pipeline_and_load() -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """Process game data from Dropbox and load the results, raising if nothing was produced"""
+    process_dropbox_data(DROPBOX_FOLDER)
 
-    except Exception as e:
-        print(f"Error processing data: {str(e)}")
-        return generate_all_data()
+    data = load_stats_data()
+    if any(df is None for df in data):
+        raise RuntimeError("Statistics were not produced")
+    return data
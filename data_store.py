@@ -0,0 +1,233 @@
+import threading
+import time
+import pandas as pd
+import streamlit as st
+from datetime import datetime
+from typing import Callable, Dict, NamedTuple, Optional, Tuple
+from data_loader import run_pipeline_and_load, load_stats_data, DROPBOX_FOLDER, LOCAL_GAME_DIR
+from data_generator import generate_all_data
+from data_processing.storage import table_modified_time
+from data_processing.views import VIEWS_DIR
+from data_index import DataIndex, build_data_index
+from player_search import PlayerSearchIndex
+from pass_network import PassingNetwork
+from form_stats import RollingStats, build_player_form, build_team_form
+from dropbox_utils import has_folder_changed
+
+# Full pipeline refresh interval, and how often Dropbox is polled for changes in between
+REFRESH_INTERVAL_SECONDS = 3600
+CHANGE_POLL_SECONDS = 120
+
+# After a failed refresh, automatic retries wait this long, doubling per failure up to the refresh interval
+RETRY_BACKOFF_SECONDS = CHANGE_POLL_SECONDS
+
+class DataSnapshot(NamedTuple):
+    """One immutable version of the dashboard data, shared by every session"""
+    version: int
+    teams_df: pd.DataFrame
+    players_df: pd.DataFrame
+    games_df: pd.DataFrame
+    views: Dict[str, pd.DataFrame]
+    index: DataIndex
+    search_index: PlayerSearchIndex
+    pass_network: PassingNetwork
+    player_form: RollingStats
+    team_form: RollingStats
+    data_as_of: float
+    # Sample data stands in when no statistics have ever been computed
+    is_sample: bool = False
+
+# Loaders return the teams, players and games tables plus the precomputed views
+DataLoader = Callable[[], Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, Dict[str, pd.DataFrame]]]
+
+class SharedDataStore:
+    """Process-wide holder of the current data snapshot
+
+    Sessions never copy the frames; they read the current snapshot and
+    remember its version. Refreshes build a new snapshot and swap it in
+    atomically, and concurrent refresh requests share a single pipeline run.
+    A failed refresh keeps the last good snapshot; if there is none yet it
+    loads the stored statistics, and only uses `fallback_loader` when there
+    are none. Frames in a snapshot must be treated as read-only.
+    """
+
+    def __init__(self, loader: DataLoader, initial_loader: Optional[DataLoader] = None,
+                 fallback_loader: Optional[DataLoader] = None):
+        self._loader = loader
+        self._initial_loader = initial_loader
+        self._fallback_loader = fallback_loader
+        self._snapshot: Optional[DataSnapshot] = None
+        self._refresh_lock = threading.Lock()
+        self._initial_lock = threading.Lock()
+        self._refresh_count = 0
+        self.refreshing = False
+        self.last_error: Optional[str] = None
+
+    @property
+    def snapshot(self) -> Optional[DataSnapshot]:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot else 0
+
+    def publish(self, teams_df: pd.DataFrame, players_df: pd.DataFrame, games_df: pd.DataFrame,
+                views: Dict[str, pd.DataFrame], data_as_of: Optional[float] = None,
+                is_sample: bool = False) -> DataSnapshot:
+        """Swap in a new snapshot; readers see either the old or the new one, never a mix"""
+        index = build_data_index(teams_df, players_df, games_df, views)
+        search_index = PlayerSearchIndex(players_df)
+        pass_network = PassingNetwork(views['pass_network'])
+        player_form = build_player_form(players_df, views['player_game_log'])
+        team_form = build_team_form(teams_df, views['team_game_log'])
+        snapshot = DataSnapshot(self.version + 1, teams_df, players_df, games_df, views, index, search_index,
+                                pass_network, player_form, team_form, data_as_of or time.time(), is_sample)
+        self._snapshot = snapshot
+        return snapshot
+
+    def refresh(self) -> Optional[DataSnapshot]:
+        """Rebuild the data, joining a refresh that is already running instead of starting another"""
+        refreshes_before = self._refresh_count
+        with self._refresh_lock:
+            # Someone else refreshed while we waited for the lock
+            if self._refresh_count != refreshes_before:
+                return self._snapshot
+
+            self.refreshing = True
+            try:
+                snapshot = self.publish(*self._loader())
+                self.last_error = None
+                return snapshot
+            except Exception as e:
+                print(f"Error refreshing data: {str(e)}")
+                self.last_error = str(e)
+                if self._snapshot is None:
+                    self._load_stored()
+                if self._snapshot is None and self._fallback_loader is not None:
+                    print("Using sample data as fallback...")
+                    self.publish(*self._fallback_loader(), is_sample=True)
+                return self._snapshot
+            finally:
+                self._refresh_count += 1
+                self.refreshing = False
+
+    def get(self) -> Optional[DataSnapshot]:
+        """Current snapshot, loading previously computed data on first use
+
+        Never runs the pipeline, so serving a page never waits for it.
+        """
+        if self._snapshot is None:
+            self._load_stored()
+        return self._snapshot
+
+    def _load_stored(self):
+        """Publish the previously computed data, if there is any and nothing is published yet"""
+        if self._initial_loader is None:
+            return
+        # Separate lock, so a running pipeline refresh never blocks this
+        with self._initial_lock:
+            if self._snapshot is None:
+                data = self._initial_loader()
+                if all(df is not None for df in data):
+                    self.publish(*data, data_as_of=table_modified_time(VIEWS_DIR, 'teams'))
+
+class RefreshWorker(threading.Thread):
+    """Background thread that refreshes the store on an interval or when Dropbox changes
+
+    After a failed refresh, change-triggered refreshes back off exponentially
+    so a broken source is not retried on every poll; explicit requests and
+    the regular interval still go ahead.
+    """
+
+    def __init__(self, store: SharedDataStore, interval: float = REFRESH_INTERVAL_SECONDS,
+                 poll_interval: float = CHANGE_POLL_SECONDS,
+                 change_check: Optional[Callable[[], bool]] = None):
+        super().__init__(name="data-refresh", daemon=True)
+        self.store = store
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.change_check = change_check
+        self._wake = threading.Event()
+
+    def request_refresh(self):
+        """Ask for a refresh as soon as possible, without waiting for it"""
+        self._wake.set()
+
+    def _source_changed(self) -> bool:
+        if self.change_check is None:
+            return False
+        try:
+            return self.change_check()
+        except Exception as e:
+            print(f"Error checking for data changes: {str(e)}")
+            return False
+
+    def _retry_delay(self, failures: int) -> float:
+        """Wait before a change may trigger another refresh after `failures` failed ones in a row"""
+        if failures == 0:
+            return 0.0
+        return min(RETRY_BACKOFF_SECONDS * 2 ** (failures - 1), self.interval)
+
+    def run(self):
+        # Whatever was on disk at startup may be stale, so refresh straight away
+        last_refresh = 0.0
+        failures = 0
+        while True:
+            requested = self._wake.is_set()
+            self._wake.clear()
+            since_refresh = time.time() - last_refresh
+            if (requested or since_refresh >= self.interval or
+                    (since_refresh >= self._retry_delay(failures) and self._source_changed())):
+                self.store.refresh()
+                last_refresh = time.time()
+                failures = failures + 1 if self.store.last_error else 0
+            self._wake.wait(self.poll_interval)
+
+@st.cache_resource
+def get_data_store() -> SharedDataStore:
+    """The single data store shared by all sessions of this server process"""
+    return SharedDataStore(run_pipeline_and_load, load_stats_data, generate_all_data)
+
+@st.cache_resource
+def get_refresh_worker() -> RefreshWorker:
+    """Start the background refresh worker once per server process"""
+    worker = RefreshWorker(
+        get_data_store(),
+        change_check=lambda: has_folder_changed(DROPBOX_FOLDER, LOCAL_GAME_DIR)
+    )
+    worker.start()
+    return worker
+
+def get_shared_data() -> DataSnapshot:
+    """Data for the current session, recording which version it is looking at
+
+    Stops the page with a notice if no data has been computed yet; the
+    background worker is already building it.
+    """
+    # Stored data goes in before the worker starts, so its first refresh can't find the store empty
+    snapshot = get_data_store().get()
+    get_refresh_worker()
+    if snapshot is None:
+        st.info("Statistics are being prepared. This page will have data after the first refresh finishes.")
+        st.stop()
+
+    st.session_state.data_version = snapshot.version
+    return snapshot
+
+def request_data_refresh():
+    """Ask the background worker to reload the data for every session"""
+    get_refresh_worker().request_refresh()
+
+def show_data_freshness(snapshot: DataSnapshot):
+    """Sidebar note with the time the data was computed and any refresh in progress"""
+    store = get_data_store()
+    if snapshot.is_sample:
+        st.sidebar.caption("Showing sample data; no statistics have been computed yet")
+    else:
+        as_of = datetime.fromtimestamp(snapshot.data_as_of).strftime("%Y-%m-%d %H:%M")
+        st.sidebar.caption(f"Data as of {as_of}")
+    if store.refreshing:
+        st.sidebar.caption("Refreshing in the background...")
+    elif store.last_error:
+        st.sidebar.caption("Last refresh failed; showing sample data." if snapshot.is_sample
+                           else "Last refresh failed; showing the previous data.")
@@ -1,15 +1,43 @@
+import io
 import os
+import json
+import hashlib
+import time
 import tempfile
 import pandas as pd
-from dropbox import Dropbox
-from dropbox.files import FileMetadata, FolderMetadata
-from typing import List, Dict, Optional
+import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dropbox import Dropbox, create_session
+from dropbox.exceptions import ApiError, RateLimitError, InternalServerError
+from dropbox.files import FileMetadata, FolderMetadata, DeletedMetadata
+from typing import List, Dict, Optional, Tuple
 import streamlit as st
 
-def get_dropbox_client():
-    """Get authenticated Dropbox client"""
+# Local record of what has already been pulled from Dropbox
+SYNC_MANIFEST_NAME = ".dropbox_sync.json"
+
+# Dropbox content hashes are computed over 4 MB blocks
+CONTENT_HASH_BLOCK_SIZE = 4 * 1024 * 1024
+
+# Parallel download defaults
+DEFAULT_DOWNLOAD_WORKERS = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+DEFAULT_FILE_TIMEOUT = 60
+
+# Errors worth retrying; anything else is a real failure
+RETRYABLE_ERRORS = (RateLimitError, InternalServerError, requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+def get_dropbox_client(max_connections: Optional[int] = None, timeout: int = DEFAULT_FILE_TIMEOUT):
+    """Get authenticated Dropbox client
+
+    `max_connections` sizes the HTTP connection pool so a single client can be
+    shared by that many download threads. Rate limits are left to the caller's
+    backoff rather than retried inside the SDK.
+    """
     access_token = st.secrets["dropbox"]["access_token"]
-    return Dropbox(access_token)
+    session = create_session(max_connections=max_connections) if max_connections else None
+    return Dropbox(access_token, session=session, timeout=timeout, max_retries_on_rate_limit=0)
 
 def list_folder_contents(dbx, path: str = "") -> List[Dict]:
     """List contents of a Dropbox folder"""
@@ -52,38 +80,288 @@ def download_file(dbx, dropbox_path: str, local_path: Optional[str] = None) -> s
     
     return local_path
 
-def download_folder_files(folder_path: str = "/2024_game_day_info", local_dir: str = "game_data") -> List[str]:
-    """Download all CSV files from a Dropbox folder"""
-    dbx = get_dropbox_client()
-    
-    # List all CSV files in the folder
-    all_files = list_folder_contents(dbx, folder_path)
-    
-    # Create local directory
+def call_with_retry(func, *args, max_retries: int = DEFAULT_MAX_RETRIES,
+                    backoff: float = DEFAULT_BACKOFF_SECONDS, **kwargs):
+    """Call a Dropbox operation, backing off exponentially on rate limits and transient errors"""
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except RETRYABLE_ERRORS as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            # Dropbox tells us how long to wait when rate limiting
+            if isinstance(e, RateLimitError) and e.backoff:
+                delay = max(delay, e.backoff)
+            time.sleep(delay)
+
+def download_file_with_retry(dbx, dropbox_path: str, local_path: str,
+                             max_retries: int = DEFAULT_MAX_RETRIES,
+                             backoff: float = DEFAULT_BACKOFF_SECONDS) -> str:
+    """Download a file, retrying rate limits and transient errors"""
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+
+    # Download next to the target and rename, so readers never see a partial file
+    tmp_path = local_path + ".part"
+    try:
+        call_with_retry(dbx.files_download_to_file, tmp_path, dropbox_path,
+                        max_retries=max_retries, backoff=backoff)
+        os.replace(tmp_path, local_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return local_path
+
+def download_files_parallel(dbx, downloads: List[Tuple[str, str]],
+                            max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                            max_retries: int = DEFAULT_MAX_RETRIES,
+                            backoff: float = DEFAULT_BACKOFF_SECONDS):
+    """Download (dropbox_path, local_path) pairs over a bounded thread pool
+
+    Yields (dropbox_path, local_path) as each download finishes. All threads
+    share `dbx`; per-file timeouts come from the client's request timeout.
+    """
+    if max_workers <= 1:
+        for dropbox_path, local_path in downloads:
+            yield dropbox_path, download_file_with_retry(dbx, dropbox_path, local_path, max_retries, backoff)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(download_file_with_retry, dbx, dropbox_path, local_path, max_retries, backoff): dropbox_path
+            for dropbox_path, local_path in downloads
+        }
+        try:
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # Don't start queued downloads after a failure
+            for future in futures:
+                future.cancel()
+
+def compute_content_hash(local_path: str) -> str:
+    """Compute the Dropbox content hash of a local file"""
+    block_hashes = b""
+    with open(local_path, "rb") as f:
+        while True:
+            block = f.read(CONTENT_HASH_BLOCK_SIZE)
+            if not block:
+                break
+            block_hashes += hashlib.sha256(block).digest()
+    return hashlib.sha256(block_hashes).hexdigest()
+
+def load_sync_manifest(local_dir: str, folder_path: str) -> Dict:
+    """Load the sync manifest for a local mirror of a Dropbox folder"""
+    manifest_path = os.path.join(local_dir, SYNC_MANIFEST_NAME)
+    empty_manifest = {'folder': folder_path, 'cursor': None, 'files': {}}
+
+    if not os.path.exists(manifest_path):
+        return empty_manifest
+
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return empty_manifest
+
+    # A manifest for a different folder is of no use
+    if manifest.get('folder', '').lower() != folder_path.lower():
+        return empty_manifest
+
+    return manifest
+
+def save_sync_manifest(manifest: Dict, local_dir: str):
+    """Atomically write the sync manifest"""
     os.makedirs(local_dir, exist_ok=True)
-    
-    # Download each file
-    downloaded_files = []
-    for file_info in all_files:
-        dropbox_path = file_info['path']
-        local_path = os.path.join(local_dir, os.path.basename(dropbox_path))
-        download_file(dbx, dropbox_path, local_path)
-        downloaded_files.append(local_path)
-        
-    return downloaded_files
+    manifest_path = os.path.join(local_dir, SYNC_MANIFEST_NAME)
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+def list_folder_changes(dbx, path: str, cursor: Optional[str] = None) -> Tuple[Optional[list], str]:
+    """List entries changed since `cursor`, or the whole folder if no cursor is given
+
+    Returns (None, "") when the saved cursor has been reset by Dropbox and a
+    full listing is required.
+    """
+    try:
+        if cursor:
+            result = dbx.files_list_folder_continue(cursor)
+        else:
+            result = dbx.files_list_folder(path, recursive=True)
+    except ApiError as e:
+        if cursor and e.error.is_reset():
+            return None, ""
+        raise
+
+    entries = list(result.entries)
+    while result.has_more:
+        result = dbx.files_list_folder_continue(result.cursor)
+        entries.extend(result.entries)
+
+    return entries, result.cursor
+
+def _local_path_for(entry_path: str, folder_path: str, local_dir: str) -> str:
+    """Mirror a Dropbox path below `folder_path` into `local_dir`"""
+    relative = entry_path[len(folder_path.rstrip('/')):].lstrip('/')
+    return os.path.join(local_dir, *relative.split('/'))
+
+def sync_folder_files(folder_path: str = "/2024_game_day_info", local_dir: str = "game_day_info", dbx=None,
+                      max_workers: int = DEFAULT_DOWNLOAD_WORKERS) -> Dict:
+    """Bring a local mirror of a Dropbox folder up to date, fetching only new or changed CSVs
 
-def read_csv_from_dropbox(file_path: str) -> pd.DataFrame:
+    Returns the local paths downloaded, deleted and currently mirrored, plus
+    the number of bytes downloaded.
+    """
+    if dbx is None:
+        dbx = get_dropbox_client(max_connections=max_workers)
+
+    manifest = load_sync_manifest(local_dir, folder_path)
+    known_files = manifest['files']
+
+    # Only look at what changed since the last sync, if we have a cursor
+    entries, cursor = list_folder_changes(dbx, folder_path, manifest['cursor'])
+    full_listing = not manifest['cursor']
+    if entries is None:
+        entries, cursor = list_folder_changes(dbx, folder_path)
+        full_listing = True
+
+    to_download = []
+    deleted = []
+    seen = set()
+    for entry in entries:
+        if isinstance(entry, DeletedMetadata):
+            # Deleting a folder removes everything below it
+            prefix = entry.path_lower.rstrip('/') + '/'
+            for key in [k for k in known_files if k == entry.path_lower or k.startswith(prefix)]:
+                deleted.append(known_files.pop(key)['local_path'])
+            continue
+
+        if not (isinstance(entry, FileMetadata) and entry.name.endswith('.csv')):
+            continue
+
+        seen.add(entry.path_lower)
+        known = known_files.get(entry.path_lower)
+        local_path = _local_path_for(entry.path_display, folder_path, local_dir)
+        if (known is not None
+                and known['content_hash'] == entry.content_hash
+                and os.path.exists(local_path)
+                and os.path.getsize(local_path) == entry.size):
+            continue
+
+        to_download.append((entry, local_path))
+
+    # A full listing also tells us which files disappeared while we had no cursor
+    if full_listing:
+        for key in [k for k in known_files if k not in seen]:
+            deleted.append(known_files.pop(key)['local_path'])
+
+    for local_path in deleted:
+        if os.path.exists(local_path):
+            os.remove(local_path)
+
+    entries_by_path = {entry.path_display: entry for entry, _ in to_download}
+    downloads = [(entry.path_display, local_path) for entry, local_path in to_download]
+
+    downloaded = []
+    bytes_downloaded = 0
+    try:
+        for dropbox_path, local_path in download_files_parallel(dbx, downloads, max_workers):
+            entry = entries_by_path[dropbox_path]
+            known_files[entry.path_lower] = {
+                'path': entry.path_display,
+                'rev': entry.rev,
+                'content_hash': entry.content_hash,
+                'size': entry.size,
+                'local_path': local_path
+            }
+            downloaded.append(local_path)
+            bytes_downloaded += entry.size
+    finally:
+        # Keep whatever finished so an interrupted sync does not start over
+        save_sync_manifest(manifest, local_dir)
+
+    manifest['cursor'] = cursor
+    save_sync_manifest(manifest, local_dir)
+
+    return {
+        'downloaded': downloaded,
+        'deleted': deleted,
+        'files': [info['local_path'] for info in known_files.values()],
+        'bytes_downloaded': bytes_downloaded
+    }
+
+def has_folder_changed(folder_path: str = "/2024_game_day_info", local_dir: str = "game_day_info", dbx=None) -> bool:
+    """Check whether any CSV in the folder changed since the last sync, without downloading
+
+    Uses the saved cursor, so this is a single cheap API call. The cursor is
+    not advanced; the next sync picks the changes up. Without a cursor there
+    is nothing to compare against, so this reports no change and leaves the
+    first sync to the periodic refresh; otherwise a sync that keeps failing
+    before it saves a cursor would set off a full refresh on every poll.
+    """
+    manifest = load_sync_manifest(local_dir, folder_path)
+    if not manifest['cursor']:
+        return False
+
+    if dbx is None:
+        dbx = get_dropbox_client()
+
+    entries, _ = list_folder_changes(dbx, folder_path, manifest['cursor'])
+    if entries is None:
+        return True
+
+    return any(
+        isinstance(entry, DeletedMetadata) or
+        (isinstance(entry, FileMetadata) and entry.name.endswith('.csv'))
+        for entry in entries
+    )
+
+def download_folder_files(folder_path: str = "/2024_game_day_info", local_dir: str = "game_data", incremental: bool = True,
+                          max_workers: int = DEFAULT_DOWNLOAD_WORKERS, dbx=None) -> List[str]:
+    """Download all CSV files from a Dropbox folder
+
+    With `incremental` set, only files that are new or changed since the
+    previous call are fetched; otherwise the local mirror is rebuilt.
+    """
+    if not incremental:
+        manifest_path = os.path.join(local_dir, SYNC_MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+
+    result = sync_folder_files(folder_path, local_dir, dbx=dbx, max_workers=max_workers)
+    return result['files']
+
+def _read_csv_response(dbx, file_path: str, **read_csv_kwargs) -> pd.DataFrame:
+    """Download a file and parse the response body without touching disk"""
+    _, response = dbx.files_download(file_path)
+    try:
+        return pd.read_csv(io.BytesIO(response.content), **read_csv_kwargs)
+    finally:
+        response.close()
+
+def read_csv_from_dropbox(file_path: str, dbx=None, **read_csv_kwargs) -> pd.DataFrame:
     """Read a CSV file directly from Dropbox into a pandas DataFrame"""
-    dbx = get_dropbox_client()
-    
-    # Download the file to a temporary location
-    local_path = download_file(dbx, file_path)
-    
-    # Read the file
-    df = pd.read_csv(local_path)
-    
-    # Clean up
-    if os.path.exists(local_path):
-        os.remove(local_path)
-        
-    return df
+    if dbx is None:
+        dbx = get_dropbox_client()
+
+    return call_with_retry(_read_csv_response, dbx, file_path, **read_csv_kwargs)
+
+def read_csvs_from_dropbox(file_paths: List[str], dbx=None,
+                           max_workers: int = DEFAULT_DOWNLOAD_WORKERS,
+                           **read_csv_kwargs) -> Dict[str, pd.DataFrame]:
+    """Read many CSV files from Dropbox in parallel, keyed by Dropbox path"""
+    if dbx is None:
+        dbx = get_dropbox_client(max_connections=max_workers)
+
+    if max_workers <= 1:
+        return {path: read_csv_from_dropbox(path, dbx, **read_csv_kwargs) for path in file_paths}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            path: executor.submit(read_csv_from_dropbox, path, dbx, **read_csv_kwargs)
+            for path in file_paths
+        }
+        return {path: future.result() for path, future in futures.items()}
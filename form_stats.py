@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+# Stats summed over a window of games, for players and for teams
+PLAYER_FORM_STATS = ['points', 'assists', 'blocks', 'turnovers', 'completions', 'throws', 'catches']
+TEAM_FORM_STATS = ['wins', 'losses', 'points_for', 'points_against']
+
+# Windows offered by the form selectors; a week range is chosen separately
+FORM_WINDOWS: Dict[str, Dict] = {
+    "Season": {},
+    "Last 3 games": {'last_n': 3},
+    "Last 5 games": {'last_n': 5},
+    "Home games": {'venue': 'home'},
+    "Away games": {'venue': 'away'}
+}
+WEEK_RANGE = "Week range"
+
+class RollingStats:
+    """Totals over any window of each entity's games, answered from prefix sums
+
+    Game rows are ordered by entity and week, and one cumulative sum per stat
+    runs over all of them, so an entity's total over a run of its games is
+    the difference of two prefix rows. Home games keep prefix sums of their
+    own, so venue splits are differences too. A window query for every
+    entity is a few vectorized lookups; nothing is regrouped.
+    """
+
+    def __init__(self, game_log: pd.DataFrame, entities: pd.DataFrame, stats: List[str]):
+        self.stats = stats
+        self._columns = ['games'] + stats
+        keys = list(entities.columns)
+
+        # Step 1: Entity number of each game row, in the order of `entities`; rows of other entities are dropped
+        entity_index = pd.MultiIndex.from_frame(entities.astype(str))
+        codes = entity_index.get_indexer(pd.MultiIndex.from_frame(game_log[keys].astype(str)))
+        known = codes >= 0
+        codes = codes[known]
+        weeks = game_log['week'].to_numpy('int64')[known]
+        order = np.lexsort((weeks, codes))
+        self._codes, self._weeks = codes[order], weeks[order]
+
+        # Step 2: Prefix sums over the ordered rows, with a leading zero row
+        values = np.column_stack([np.ones(len(order))] + [
+            game_log[stat].to_numpy('float64')[known][order] for stat in stats
+        ])
+        home = game_log['home'].to_numpy(bool)[known][order]
+        self._prefix = np.vstack([np.zeros(len(self._columns)), np.cumsum(values, axis=0)])
+        self._home_prefix = np.vstack([np.zeros(len(self._columns)), np.cumsum(values * home[:, None], axis=0)])
+
+        # Step 3: Each entity's rows are one contiguous run
+        entity_codes = np.arange(len(entities))
+        self._first = np.searchsorted(self._codes, entity_codes, side='left')
+        self._stop = np.searchsorted(self._codes, entity_codes, side='right')
+
+        # Sort key for week lookups: entity number, then week
+        self._week_span = int(self._weeks.max()) + 1 if len(self._weeks) else 1
+        self._entity_weeks = self._codes * self._week_span + self._weeks
+
+    def _bounds(self, last_n: Optional[int], weeks: Optional[Tuple[int, int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """First and stop row of every entity's window"""
+        first, stop = self._first, self._stop
+        if weeks is not None:
+            entity_base = np.arange(len(first)) * self._week_span
+            low, high = max(int(weeks[0]), 0), min(int(weeks[1]), self._week_span - 1)
+            first = np.searchsorted(self._entity_weeks, entity_base + low, side='left')
+            stop = np.maximum(np.searchsorted(self._entity_weeks, entity_base + high, side='right'), first)
+        if last_n is not None:
+            first = np.maximum(first, stop - last_n)
+        return first, stop
+
+    def window(self, last_n: Optional[int] = None, weeks: Optional[Tuple[int, int]] = None,
+               venue: Optional[str] = None) -> pd.DataFrame:
+        """Games played and stat totals of every entity over a window, in the order of `entities`
+
+        `last_n` keeps each entity's latest games (within `weeks`, an
+        inclusive range, when given); `venue` ('home' or 'away') then keeps
+        the window's games at that venue.
+        """
+        first, stop = self._bounds(last_n, weeks)
+        totals = self._prefix[stop] - self._prefix[first]
+        if venue is not None:
+            home = self._home_prefix[stop] - self._home_prefix[first]
+            totals = home if venue == 'home' else totals - home
+        return pd.DataFrame(totals, columns=self._columns).astype(int)
+
+def build_player_form(players_df: pd.DataFrame, player_game_log: pd.DataFrame) -> RollingStats:
+    """Rolling stats for the rows of the players table"""
+    return RollingStats(player_game_log, players_df[['name', 'team']], PLAYER_FORM_STATS)
+
+def build_team_form(teams_df: pd.DataFrame, team_game_log: pd.DataFrame) -> RollingStats:
+    """Rolling stats for the rows of the teams table, from each team's side of its games"""
+    game_log = team_game_log.assign(
+        wins=(team_game_log['score'] > team_game_log['opponent_score']).astype(int),
+        losses=(team_game_log['score'] < team_game_log['opponent_score']).astype(int),
+        points_for=team_game_log['score'].fillna(0),
+        points_against=team_game_log['opponent_score'].fillna(0)
+    )
+    return RollingStats(game_log, teams_df[['name']].rename(columns={'name': 'team'}), TEAM_FORM_STATS)
@@ -0,0 +1,155 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from typing import Dict, List, Optional, Tuple
+
+# Per-edge measures, each kept as its own sparse matrix
+EDGE_MEASURES = ['completions', 'turnovers', 'yards']
+
+TOP_CONNECTIONS = 10
+
+# PageRank over completions: a player ranks high when well-connected players complete passes to them
+PAGERANK_DAMPING = 0.85
+PAGERANK_MAX_ITERATIONS = 100
+PAGERANK_TOLERANCE = 1e-10
+
+CONNECTION_COLUMNS = ['thrower', 'receiver', 'completions', 'turnovers', 'yards', 'completion_percentage']
+CENTRALITY_COLUMNS = ['name', 'completions_thrown', 'completions_caught', 'throwaways', 'partners',
+                      'degree_centrality', 'pagerank']
+
+# A game is identified by its match and week
+GameKey = Tuple[str, int]
+
+class PassingNetwork:
+    """Thrower-to-receiver passing networks per team, for the season and for single games
+
+    Every (team, player) pair is a node, numbered team by team, so each
+    team's season network is a diagonal block of one sparse matrix per
+    measure, all built in a single vectorized pass over the edges. A game's
+    network is built from its edges the first time it is asked for and then
+    kept, as the network lives as long as its data snapshot.
+    """
+
+    def __init__(self, pass_network: pd.DataFrame):
+        edges = pass_network.astype({'team': str, 'match': str, 'Thrower': str})
+        receivers = pass_network['Receiver'].astype(str).where(pass_network['Receiver'].notna())
+
+        # Step 1: Number players team by team
+        nodes = pd.concat([
+            pd.DataFrame({'team': edges['team'], 'name': edges['Thrower']}),
+            pd.DataFrame({'team': edges['team'], 'name': receivers}).dropna()
+        ]).drop_duplicates().sort_values(['team', 'name'], kind='stable')
+        node_index = pd.MultiIndex.from_frame(nodes)
+        self._names = nodes['name'].to_numpy()
+        team_nodes = pd.Series(np.arange(len(nodes)), index=nodes['team'].to_numpy())
+        self._team_bounds: Dict[str, Tuple[int, int]] = {
+            team: (positions.min(), positions.max() + 1) for team, positions in team_nodes.groupby(level=0)
+        }
+
+        # Step 2: Edge endpoints as node numbers; throwaways have no receiver (-1)
+        self._rows = node_index.get_indexer(pd.MultiIndex.from_arrays([edges['team'], edges['Thrower']]))
+        self._cols = node_index.get_indexer(pd.MultiIndex.from_arrays([edges['team'], receivers]))
+        self._values = {measure: edges[measure].fillna(0).to_numpy('float64') for measure in EDGE_MEASURES}
+        self._game_edges = pd.Series(np.arange(len(edges))).groupby(
+            [edges['team'].to_numpy(), edges['match'].to_numpy(), edges['week'].to_numpy()]).indices
+
+        # Step 3: Season matrices over all nodes; repeated edges from different games add up
+        self._season = self._matrices(np.arange(len(edges)), 0, len(nodes))
+        self._game_networks: Dict[Tuple[str, str, int], Dict[str, sparse.csr_matrix]] = {}
+
+    def _matrices(self, edge_positions: np.ndarray, first_node: int, stop_node: int) -> Dict[str, sparse.csr_matrix]:
+        """Sparse matrices of the given edges over nodes first_node..stop_node, plus throwaways per thrower"""
+        size = stop_node - first_node
+        rows = self._rows[edge_positions] - first_node
+        cols = self._cols[edge_positions] - first_node
+        targeted = self._cols[edge_positions] >= 0
+
+        matrices = {
+            measure: sparse.csr_matrix(
+                (self._values[measure][edge_positions][targeted], (rows[targeted], cols[targeted])),
+                shape=(size, size))
+            for measure in EDGE_MEASURES
+        }
+        matrices['throwaways'] = np.bincount(
+            rows[~targeted], weights=self._values['turnovers'][edge_positions][~targeted], minlength=size)
+        return matrices
+
+    def network(self, team: str, game: Optional[GameKey] = None) -> Tuple[List[str], Dict[str, sparse.csr_matrix]]:
+        """Player names and edge matrices of a team's network, for the season or one game"""
+        if team not in self._team_bounds:
+            return [], {}
+        first_node, stop_node = self._team_bounds[team]
+        names = list(self._names[first_node:stop_node])
+
+        if game is None:
+            matrices = {measure: self._season[measure][first_node:stop_node, first_node:stop_node]
+                        for measure in EDGE_MEASURES}
+            matrices['throwaways'] = self._season['throwaways'][first_node:stop_node]
+            return names, matrices
+
+        key = (team, str(game[0]), int(game[1]))
+        if key not in self._game_networks:
+            edge_positions = self._game_edges.get(key, np.array([], dtype=np.intp))
+            self._game_networks[key] = self._matrices(edge_positions, first_node, stop_node)
+        return names, self._game_networks[key]
+
+    def top_connections(self, team: str, game: Optional[GameKey] = None, by: str = 'completions',
+                        n: int = TOP_CONNECTIONS) -> pd.DataFrame:
+        """A team's strongest thrower-to-receiver pairs by one edge measure"""
+        names, matrices = self.network(team, game)
+        if not names:
+            return pd.DataFrame(columns=CONNECTION_COLUMNS)
+
+        attempts = (matrices['completions'] + matrices['turnovers']).tocoo()
+        strength = np.asarray(matrices[by][attempts.row, attempts.col]).ravel()
+        top = np.argsort(-strength, kind='stable')[:n]
+        rows, cols = attempts.row[top], attempts.col[top]
+
+        connections = pd.DataFrame({
+            'thrower': np.asarray(names)[rows],
+            'receiver': np.asarray(names)[cols],
+            **{measure: np.asarray(matrices[measure][rows, cols]).ravel() for measure in EDGE_MEASURES}
+        })
+        connections['completion_percentage'] = connections['completions'] / attempts.data[top]
+        return connections.astype({'completions': int, 'turnovers': int})
+
+    def centrality(self, team: str, game: Optional[GameKey] = None) -> pd.DataFrame:
+        """Per-player volume, distinct partners, degree centrality and PageRank in a team's network"""
+        names, matrices = self.network(team, game)
+        if not names:
+            return pd.DataFrame(columns=CENTRALITY_COLUMNS)
+
+        completions = matrices['completions']
+        attempts = completions + matrices['turnovers']
+        connected = ((attempts + attempts.T) > 0).astype(int)
+        # Passes to oneself (recording slips) don't make a partner
+        partners = np.asarray(connected.sum(axis=1)).ravel() - connected.diagonal()
+
+        return pd.DataFrame({
+            'name': names,
+            'completions_thrown': np.asarray(completions.sum(axis=1)).ravel().astype(int),
+            'completions_caught': np.asarray(completions.sum(axis=0)).ravel().astype(int),
+            'throwaways': matrices['throwaways'].astype(int),
+            'partners': partners,
+            'degree_centrality': partners / max(len(names) - 1, 1),
+            'pagerank': pagerank(completions)
+        })
+
+def pagerank(weights: sparse.csr_matrix, damping: float = PAGERANK_DAMPING) -> np.ndarray:
+    """PageRank of a weighted directed graph by power iteration on the sparse matrix
+
+    Players who never complete a pass spread their rank evenly over everyone.
+    """
+    size = weights.shape[0]
+    out_weight = np.asarray(weights.sum(axis=1)).ravel()
+    dangling = out_weight == 0
+    transition = sparse.diags(np.divide(1.0, out_weight, out=np.zeros(size), where=~dangling)) @ weights
+
+    rank = np.full(size, 1.0 / size)
+    for _ in range(PAGERANK_MAX_ITERATIONS):
+        spread = rank[dangling].sum() / size
+        updated = (1 - damping) / size + damping * (transition.T @ rank + spread)
+        if np.abs(updated - rank).sum() < PAGERANK_TOLERANCE:
+            return updated
+        rank = updated
+    return rank
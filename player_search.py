@@ -0,0 +1,102 @@
+import difflib
+import unicodedata
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+# Stats the Players page can sort by, each kept as a precomputed ordering
+SORT_STATS = ["points", "assists", "completions", "throws", "catches"]
+
+# Names are indexed by every substring up to this length
+GRAM_SIZE = 3
+
+# Fuzzy matching settings
+FUZZY_CUTOFF = 0.6
+FUZZY_LIMIT = 50
+
+def normalize_name(name: str) -> str:
+    """Lowercase a name and strip accents, so "José" matches "jose\""""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).casefold().strip()
+
+def _grams(text: str, size: int) -> set:
+    """All substrings of `text` of exactly `size` characters"""
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+class PlayerSearchIndex:
+    """Substring and fuzzy search over player names, with results in a presorted stat order
+
+    Every substring of up to GRAM_SIZE characters maps to the players whose
+    name contains it. Short queries are a single lookup; longer ones
+    intersect the postings of their GRAM_SIZE-grams and verify the
+    survivors. Results come back as row positions into the players table,
+    ordered by a stat using orderings sorted once: the empty query returns
+    an ordering as it is, others keep its positions that matched.
+    """
+
+    def __init__(self, players_df: pd.DataFrame, sort_stats: List[str] = SORT_STATS):
+        self.names = [normalize_name(name) for name in players_df['name']]
+        self._all = np.arange(len(self.names))
+
+        postings: Dict[str, List[int]] = {}
+        for position, name in enumerate(self.names):
+            for size in range(1, GRAM_SIZE + 1):
+                for gram in _grams(name, size):
+                    postings.setdefault(gram, []).append(position)
+        self._postings = {gram: np.array(positions) for gram, positions in postings.items()}
+
+        # Row positions in descending stat order
+        self._orders = {
+            stat: np.argsort(-players_df[stat].to_numpy(dtype=float), kind='stable')
+            for stat in sort_stats if stat in players_df.columns
+        }
+
+    def _substring_matches(self, query: str) -> np.ndarray:
+        """Positions of names containing `query`"""
+        if not query:
+            return self._all
+        if len(query) <= GRAM_SIZE:
+            return self._postings.get(query, np.array([], dtype=int))
+
+        candidates = None
+        for gram in _grams(query, GRAM_SIZE):
+            posting = self._postings.get(gram)
+            if posting is None:
+                return np.array([], dtype=int)
+            candidates = posting if candidates is None else np.intersect1d(candidates, posting, assume_unique=True)
+
+        return np.array([p for p in candidates if query in self.names[p]], dtype=int)
+
+    def _fuzzy_matches(self, query: str) -> np.ndarray:
+        """Positions of names similar to `query`, most similar first"""
+        candidates = set()
+        for gram in _grams(query, min(len(query), GRAM_SIZE)):
+            candidates.update(self._postings.get(gram, []))
+
+        scored = []
+        for position in candidates:
+            ratio = difflib.SequenceMatcher(None, query, self.names[position]).ratio()
+            if ratio >= FUZZY_CUTOFF:
+                scored.append((-ratio, position))
+        return np.array([position for _, position in sorted(scored)[:FUZZY_LIMIT]], dtype=int)
+
+    def search(self, query: str, sort_by: Optional[str] = None, fuzzy: bool = False) -> np.ndarray:
+        """Row positions of players matching `query`, ordered by `sort_by` (descending)
+
+        With `fuzzy`, similar names are returned when nothing contains the
+        query; those stay in similarity order.
+        """
+        query = normalize_name(query)
+        matches = self._substring_matches(query)
+
+        if len(matches) == 0 and fuzzy and query:
+            return self._fuzzy_matches(query)
+
+        if sort_by in self._orders:
+            order = self._orders[sort_by]
+            if not query:
+                return order
+            matched = np.zeros(len(self.names), dtype=bool)
+            matched[matches] = True
+            return order[matched[order]]
+        return matches
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The app imports the data_processing package from UltimateDash
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "UltimateDash"))
@@ -0,0 +1,47 @@
+import pytest
+from data_generator import generate_all_data
+from data_store import SharedDataStore
+
+@pytest.fixture(scope="module")
+def stored_data():
+    return generate_all_data(teams=4, weeks=2)
+
+@pytest.fixture(scope="module")
+def sample_data():
+    return generate_all_data(teams=6, weeks=3)
+
+def failing_loader():
+    raise ConnectionError("Dropbox unreachable")
+
+def test_failed_first_refresh_keeps_stored_statistics(stored_data, sample_data):
+    store = SharedDataStore(failing_loader, lambda: stored_data, lambda: sample_data)
+
+    # The worker's first refresh can fail before any page has loaded the stored data
+    snapshot = store.refresh()
+
+    assert store.last_error == "Dropbox unreachable"
+    assert not snapshot.is_sample
+    assert snapshot.teams_df is stored_data[0]
+    assert store.get() is snapshot
+    assert store.version == 1
+
+def test_failed_refresh_uses_sample_data_only_without_stored_statistics(sample_data):
+    store = SharedDataStore(failing_loader, lambda: (None, None, None, None), lambda: sample_data)
+
+    snapshot = store.refresh()
+
+    assert snapshot.is_sample
+    assert snapshot.teams_df is sample_data[0]
+
+def test_stored_statistics_are_loaded_once(stored_data):
+    loads = []
+    def initial_loader():
+        loads.append(1)
+        return stored_data
+    store = SharedDataStore(failing_loader, initial_loader)
+
+    first = store.get()
+    store.refresh()
+
+    assert store.get() is first
+    assert len(loads) == 1
@@ -0,0 +1,81 @@
+import os
+import threading
+import pytest
+import requests
+from dropbox.exceptions import ApiError, RateLimitError
+from dropbox_utils import download_files_parallel
+
+class FakeDropbox:
+    """Stands in for a Dropbox client, failing each path with its scripted errors before succeeding"""
+
+    def __init__(self, failures=None):
+        self.failures = {path: list(errors) for path, errors in (failures or {}).items()}
+        self.calls = {}
+        self.lock = threading.Lock()
+
+    def files_download_to_file(self, download_path, path):
+        with self.lock:
+            self.calls[path] = self.calls.get(path, 0) + 1
+            errors = self.failures.get(path)
+            error = errors.pop(0) if errors else None
+        # Write part of the file first, as an interrupted download would
+        with open(download_path, "w") as f:
+            f.write(f"partial {path}")
+            if error is not None:
+                raise error
+            f.write(" complete")
+
+def downloads_for(tmp_path, names):
+    return [(f"/games/{name}", str(tmp_path / "local" / name)) for name in names]
+
+def leftover_part_files(tmp_path):
+    return [name for name in os.listdir(tmp_path / "local") if name.endswith(".part")]
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_retries_rate_limits_and_transient_errors(tmp_path, max_workers):
+    downloads = downloads_for(tmp_path, ["a.csv", "b.csv", "c.csv"])
+    dbx = FakeDropbox({
+        "/games/a.csv": [RateLimitError("req", backoff=0)],
+        "/games/b.csv": [requests.exceptions.ConnectionError(), requests.exceptions.ConnectionError()]
+    })
+
+    done = dict(download_files_parallel(dbx, downloads, max_workers=max_workers, max_retries=3, backoff=0))
+
+    assert done == dict(downloads)
+    assert dbx.calls == {"/games/a.csv": 2, "/games/b.csv": 3, "/games/c.csv": 1}
+    for dropbox_path, local_path in downloads:
+        with open(local_path) as f:
+            assert f.read() == f"partial {dropbox_path} complete"
+    assert leftover_part_files(tmp_path) == []
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_timeout_fails_after_retries_without_leaving_a_file(tmp_path, max_workers):
+    downloads = downloads_for(tmp_path, ["slow.csv"])
+    dbx = FakeDropbox({"/games/slow.csv": [requests.exceptions.Timeout()] * 3})
+
+    with pytest.raises(requests.exceptions.Timeout):
+        list(download_files_parallel(dbx, downloads, max_workers=max_workers, max_retries=2, backoff=0))
+
+    assert dbx.calls == {"/games/slow.csv": 3}
+    assert not os.path.exists(downloads[0][1])
+    assert leftover_part_files(tmp_path) == []
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_partial_failure_keeps_finished_files_and_drops_the_failed_one(tmp_path, max_workers):
+    downloads = downloads_for(tmp_path, ["a.csv", "missing.csv", "c.csv"])
+    # Errors that aren't transient aren't retried
+    dbx = FakeDropbox({"/games/missing.csv": [ApiError("req", "path/not_found", None, None)]})
+
+    done = {}
+    with pytest.raises(ApiError):
+        for dropbox_path, local_path in download_files_parallel(dbx, downloads, max_workers=max_workers,
+                                                                max_retries=3, backoff=0):
+            done[dropbox_path] = local_path
+
+    assert dbx.calls["/games/missing.csv"] == 1
+    assert "/games/missing.csv" not in done
+    assert not os.path.exists(str(tmp_path / "local" / "missing.csv"))
+    for dropbox_path, local_path in done.items():
+        with open(local_path) as f:
+            assert f.read() == f"partial {dropbox_path} complete"
+    assert leftover_part_files(tmp_path) == []
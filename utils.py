@@ -1,4 +1,5 @@
 import streamlit as st
+from form_stats import FORM_WINDOWS, WEEK_RANGE
 
 def load_css():
     st.markdown("""
@@ -14,23 +15,42 @@ def load_css():
         </style>
     """, unsafe_allow_html=True)
 
-def calculate_team_stats(games_df, team_name):
-    team_games = games_df[
-        (games_df['team1'] == team_name) | 
-        (games_df['team2'] == team_name)
-    ]
-    
-    wins = 0
-    total_points = 0
-    
-    for _, game in team_games.iterrows():
-        if game['team1'] == team_name:
-            total_points += game['team1_score']
-            if game['team1_score'] > game['team2_score']:
-                wins += 1
-        else:
-            total_points += game['team2_score']
-            if game['team2_score'] > game['team1_score']:
-                wins += 1
-    
+def calculate_team_stats(games_df, team_name, index=None):
+    """Wins, games played and points scored for a team
+
+    With a DataIndex the team's game log is a lookup; otherwise the games
+    table is scanned once.
+    """
+    if index is not None:
+        team_games = index.team_games(team_name)
+        scores = team_games['score']
+        opponent_scores = team_games['opponent_score']
+    else:
+        is_team1 = games_df['team1'] == team_name
+        team_games = games_df[is_team1 | (games_df['team2'] == team_name)]
+        is_team1 = is_team1[team_games.index]
+        scores = team_games['team1_score'].where(is_team1, team_games['team2_score'])
+        opponent_scores = team_games['team2_score'].where(is_team1, team_games['team1_score'])
+
+    wins = int((scores > opponent_scores).sum())
+    total_points = scores.sum()
+
     return wins, len(team_games), total_points
+
+def select_form_window(weeks, key=None):
+    """Form selector: a named window of recent games or venue, or a range of weeks
+
+    Returns the window as keyword arguments for `RollingStats.window`; the
+    season is an empty dict.
+    """
+    form = st.selectbox("Form", list(FORM_WINDOWS) + [WEEK_RANGE], key=key)
+    if form != WEEK_RANGE:
+        return FORM_WINDOWS[form]
+
+    first, last = st.select_slider(
+        "Weeks",
+        options=weeks,
+        value=(weeks[0], weeks[-1]),
+        key=f"{key}_weeks" if key else None
+    )
+    return {'weeks': (first, last)}